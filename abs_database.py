@@ -0,0 +1,159 @@
+"""Read-only access to the AudioBookShelf SQLite database (absdatabase.sqlite)."""
+
+import sqlite3
+import time
+import config
+from itertools import groupby
+from pathlib import Path
+from typing import Iterator, Optional
+from config import ABS_LIBRARY_ID
+from logger import log, log_error
+from audiobookshelf import build_series_dict_from_series, series_fingerprint
+
+
+# Path to AudioBookShelf's absdatabase.sqlite - empty to use the REST API
+ABS_DATABASE_PATH = getattr(config, "ABS_DATABASE_PATH", "")
+
+# Every book in a series of the library, with the library item it belongs to.
+# updatedAt is stored as e.g. "2024-03-01 18:22:05.123 +00:00"; it is converted
+# to epoch milliseconds, as the REST API reports it, so fingerprints match.
+SERIES_BOOKS_QUERY = """
+    SELECT s.id, s.name, li.id, li.path,
+           COALESCE(CAST(strftime('%s', li.updatedAt) AS INTEGER) * 1000
+                    + CAST(substr(strftime('%f', li.updatedAt), 4) AS INTEGER), li.updatedAt),
+           b.title, b.asin, b.id, bs.sequence
+    FROM series s
+    JOIN bookSeries bs ON bs.seriesId = s.id
+    JOIN books b ON b.id = bs.bookId
+    JOIN libraryItems li ON li.mediaId = b.id AND li.mediaType = 'book'
+    WHERE s.libraryId = ?
+    ORDER BY s.name COLLATE NOCASE, s.id, CAST(bs.sequence AS REAL), bs.sequence
+"""
+
+# Every series entry of the library's books, to rebuild ABS's seriesName field
+BOOK_SERIES_QUERY = """
+    SELECT bs.bookId, s.name, bs.sequence
+    FROM bookSeries bs
+    JOIN series s ON s.id = bs.seriesId
+    WHERE s.libraryId = ?
+    ORDER BY bs.bookId, bs.createdAt
+"""
+
+
+def open_database(path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Open the AudioBookShelf database read-only.
+
+    Args:
+        path: Path to absdatabase.sqlite (default ABS_DATABASE_PATH)
+
+    Returns:
+        Read-only SQLite connection
+
+    Raises:
+        sqlite3.Error: If the database can't be opened
+    """
+    uri = Path(path or ABS_DATABASE_PATH).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def _series_name_field(entries: list[tuple[str, Optional[str]]]) -> str:
+    """Build a book's seriesName the way ABS does: "Name #sequence, Other #2"."""
+    return ", ".join(f"{name} #{sequence}" if sequence else name for name, sequence in entries)
+
+
+def iter_database_series(conn: sqlite3.Connection, library_id: Optional[str] = None) -> Iterator[dict]:
+    """
+    Read the library's series from the database, one series at a time.
+
+    Series are yielded in the shape the REST API's /series endpoint returns
+    them (only the fields this project reads), so they can be passed to
+    build_series_dict_from_series() and series_fingerprint() unchanged.
+
+    Args:
+        conn: Connection from open_database()
+        library_id: Library to read (default ABS_LIBRARY_ID)
+
+    Yields:
+        Series objects with name and books
+    """
+    library_id = library_id or ABS_LIBRARY_ID
+
+    series_names = {}
+    for book_id, entries in groupby(conn.execute(BOOK_SERIES_QUERY, (library_id,)), key=lambda row: row[0]):
+        series_names[book_id] = _series_name_field([(name, sequence) for _, name, sequence in entries])
+
+    rows = conn.execute(SERIES_BOOKS_QUERY, (library_id,))
+    for (series_id, series_name), books in groupby(rows, key=lambda row: (row[0], row[1])):
+        yield {
+            "id": series_id,
+            "name": series_name,
+            "books": [
+                {
+                    "id": item_id,
+                    "path": path or "",
+                    "updatedAt": updated_at,
+                    "sequence": sequence,
+                    "media": {
+                        "metadata": {
+                            "title": title,
+                            "asin": asin,
+                            "seriesName": series_names.get(book_id, "")
+                        }
+                    }
+                }
+                for _, _, item_id, path, updated_at, title, asin, book_id, sequence in books
+            ]
+        }
+
+
+def fetch_series_summaries_from_database(path: Optional[str] = None,
+                                         library_id: Optional[str] = None) -> tuple[dict, dict]:
+    """
+    Read the whole library from the database as compact per-series summaries.
+
+    Drop-in replacement for audiobookshelf.fetch_series_summaries() when this
+    tool runs on the same host as AudioBookShelf.
+
+    Args:
+        path: Path to absdatabase.sqlite (default ABS_DATABASE_PATH)
+        library_id: Library to read (default ABS_LIBRARY_ID)
+
+    Returns:
+        Tuple of (dict mapping series_name -> {max_order, sample_asin, books},
+        dict mapping series_name -> fingerprint), both in library order
+
+    Raises:
+        sqlite3.Error: If the database can't be read
+    """
+    started = time.perf_counter()
+    fingerprints = {}
+
+    def fingerprinted(series_iter: Iterator[dict]) -> Iterator[dict]:
+        for series in series_iter:
+            fingerprints[series["name"]] = series_fingerprint(series)
+            yield series
+
+    try:
+        conn = open_database(path)
+        try:
+            series_dict = build_series_dict_from_series(fingerprinted(iter_database_series(conn, library_id)))
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        log_error("abs_database", f"Reading {path or ABS_DATABASE_PATH} failed: {e}")
+        raise
+
+    elapsed = time.perf_counter() - started
+    log("abs_database", f"Read {len(fingerprints)} series from {path or ABS_DATABASE_PATH} in {elapsed * 1000:.0f}ms")
+    return series_dict, fingerprints
+
+
+if __name__ == "__main__":
+    # Test the module
+    print(f"Reading series from {ABS_DATABASE_PATH}...")
+    series_dict, _ = fetch_series_summaries_from_database()
+
+    print(f"\nProcessed {len(series_dict)} series:")
+    for name, data in sorted(series_dict.items()):
+        print(f"  {name}: max #{data['max_order']} ({len(data['books'])} books)")
@@ -0,0 +1,297 @@
+"""
+Real-time AudioBookShelf listener.
+
+Subscribes to the socket.io events of every configured AudioBookShelf
+server, and watches local library folders through inotify, and refreshes
+only the series an added or updated book belongs to, a few seconds after
+the change, instead of waiting for the next full scan.
+
+AudioBookShelf servers need the optional python-socketio client:
+    pip install "python-socketio[client]"
+"""
+
+import threading
+import time
+import requests
+import config
+from typing import Optional
+from logger import log, log_error
+from circuit_breaker import CircuitOpenError
+from audible_api import end_run
+from audiobookshelf import get_sources, source_key
+from library_scanner import InotifyWatcher, book_from_path, local_series_id
+from next_book_finder import refresh_series
+from storage import get_new_releases, save_new_releases, cache_session, flush_pending_writes, CACHE_WRITE_INTERVAL
+from notifications import notify_new_releases
+
+try:
+    import socketio
+except ImportError:
+    socketio = None
+
+
+# Seconds to wait after the last event for a series before refreshing it
+LISTENER_DEBOUNCE_SECONDS = getattr(config, "LISTENER_DEBOUNCE_SECONDS", 5)
+
+# Longest a series keeps being pushed back by a steady stream of events
+MAX_DEBOUNCE_SECONDS = 60
+
+# ABS events carrying one library item, and ones carrying a list of them
+ITEM_EVENTS = ("item_added", "item_updated")
+ITEMS_EVENTS = ("items_added", "items_updated")
+
+
+class RefreshQueue:
+    """
+    Debounced set of series waiting to be refreshed.
+
+    Every event for a series pushes its refresh back to `delay` seconds
+    after that event (but never past `max_delay` after the first one), so a
+    burst of events - e.g. a folder of books being scanned in - turns into a
+    single refresh.
+    """
+
+    def __init__(self, delay: float, max_delay: float = MAX_DEBOUNCE_SECONDS):
+        self.delay = delay
+        self.max_delay = max(max_delay, delay)
+        self._pending = {}  # (source key, series_id) -> (series_name, source, first_seen, due)
+        self._condition = threading.Condition()
+
+        self.events = 0
+        self.refreshes = 0
+
+    def add(self, series_id: str, series_name: str, source: Optional[dict] = None) -> None:
+        """Queue (or push back) a refresh of a series of a library."""
+        key = (source_key(source) if source else "", series_id)
+        now = time.monotonic()
+        with self._condition:
+            self.events += 1
+            _, _, first_seen, _ = self._pending.get(key, (series_name, source, now, now))
+            self._pending[key] = (series_name, source, first_seen, min(now + self.delay, first_seen + self.max_delay))
+            self._condition.notify()
+
+    def wait_due(self, timeout: Optional[float] = None) -> list[tuple[str, str, Optional[dict]]]:
+        """
+        Wait until at least one series is due and take every due series.
+
+        Args:
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            List of (series_id, series_name, source) tuples, empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                due_keys = [key for key, (_, _, _, due_at) in self._pending.items() if due_at <= now]
+                if due_keys:
+                    due = []
+                    for key in due_keys:
+                        series_name, source, _, _ = self._pending.pop(key)
+                        due.append((key[1], series_name, source))
+                    self.refreshes += len(due)
+                    return due
+
+                waits = [due_at - now for _, _, _, due_at in self._pending.values()]
+                if deadline is not None:
+                    if now >= deadline:
+                        return []
+                    waits.append(deadline - now)
+                self._condition.wait(min(waits) if waits else None)
+
+
+def get_item_series(item: dict) -> list[tuple[str, str]]:
+    """
+    Get the series a library item belongs to, from an ABS socket event.
+
+    Args:
+        item: Expanded library item as sent with item_added / item_updated
+
+    Returns:
+        List of (series_id, series_name) tuples; empty for items without series
+    """
+    if not isinstance(item, dict):
+        return []
+
+    metadata = item.get("media", {}).get("metadata", {})
+    return [
+        (entry["id"], entry["name"])
+        for entry in metadata.get("series") or []
+        if isinstance(entry, dict) and entry.get("id") and entry.get("name")
+    ]
+
+
+def _refresh(series_id: str, series_name: str, source: Optional[dict]) -> None:
+    """Refresh one series, reporting a new release; errors are logged, not raised."""
+    try:
+        # One read and one write of next_books.json per refresh
+        with cache_session():
+            release = refresh_series(series_id, series_name, source)
+            if release:
+                save_new_releases(get_new_releases() + [release])
+    except (requests.RequestException, CircuitOpenError, OSError) as e:
+        log_error("listener", f"Refresh of {series_name} failed: {e}")
+        return
+    except Exception as e:
+        # Anything else (a locked database, a malformed item, ...) - keep listening
+        log_error("listener", f"Refresh of {series_name} failed: {type(e).__name__}: {e}")
+        return
+    finally:
+        # Each refresh looks Audible up afresh (within the response cache TTLs)
+        end_run()
+
+    if release:
+        notify_new_releases([release])
+
+
+def _connect(sources: list[dict], queue: RefreshQueue):
+    """
+    Connect to one AudioBookShelf server and queue refreshes for its events.
+
+    Args:
+        sources: The configured libraries on this server (same URL and API key)
+        queue: Queue the affected series are added to
+
+    Returns:
+        The connected socketio.Client
+    """
+    base_url, api_key = sources[0]["base_url"], sources[0]["api_key"]
+    libraries = {source["library_id"]: source for source in sources}
+    client = socketio.Client(reconnection=True)
+
+    @client.event
+    def connect():
+        log("listener", f"Connected to {base_url}, authenticating")
+        client.emit("auth", api_key)
+
+    @client.event
+    def disconnect(*args):
+        log("listener", f"Disconnected from {base_url} (will reconnect)")
+
+    @client.on("init")
+    def on_init(data):
+        print(f"Listening for changes on {base_url} (Ctrl+C to stop)...")
+        log("listener", f"Authenticated with {base_url}, listening for events")
+
+    @client.on("auth_failed")
+    def on_auth_failed(*args):
+        print(f"{base_url} rejected the API key")
+        log_error("listener", f"Authentication with {base_url} failed")
+
+    def on_items(event: str, items: list) -> None:
+        for item in items:
+            source = libraries.get(item.get("libraryId")) if isinstance(item, dict) else None
+            if source is None:
+                continue
+            for series_id, series_name in get_item_series(item):
+                log("listener", f"{event}: {series_name} ({source['name']})")
+                queue.add(series_id, series_name, source)
+
+    for event in ITEM_EVENTS:
+        client.on(event, lambda item, event=event: on_items(event, [item]))
+    for event in ITEMS_EVENTS:
+        client.on(event, lambda items, event=event: on_items(event, items if isinstance(items, list) else []))
+
+    client.connect(base_url)
+    return client
+
+
+def _watch(source: dict, queue: RefreshQueue, stop: threading.Event) -> None:
+    """
+    Watch a local library folder and queue refreshes for books that land in it.
+
+    Runs until stop is set; meant for a background thread.
+    """
+    root = source["library_path"]
+    try:
+        watcher = InotifyWatcher(root)
+    except OSError as e:
+        print(f"Can't watch {root}: {e}")
+        log_error("listener", f"Can't watch {root}: {e}")
+        return
+
+    print(f"Watching {root} for new books (Ctrl+C to stop)...")
+    log("listener", f"Watching {root}")
+    try:
+        while not stop.is_set():
+            try:
+                events = watcher.read_events(timeout=1)
+            except Exception as e:
+                log_error("listener", f"Reading changes under {root} failed: {type(e).__name__}: {e}")
+                time.sleep(1)
+                continue
+
+            for path, _ in events:
+                try:
+                    book = book_from_path(root, path)
+                except Exception as e:
+                    log_error("listener", f"Can't read {path}: {type(e).__name__}: {e}")
+                    continue
+                if book and book["series_name"]:
+                    log("listener", f"File changed: {path} ({book['series_name']})")
+                    queue.add(local_series_id(book["series_name"]), book["series_name"], source)
+    finally:
+        watcher.close()
+
+
+def run_listener(debounce: Optional[float] = None) -> int:
+    """
+    Listen for AudioBookShelf events and refresh affected series until Ctrl+C.
+
+    Args:
+        debounce: Seconds to wait after a series' last event (default LISTENER_DEBOUNCE_SECONDS)
+
+    Returns:
+        Exit code (1 if python-socketio is needed but isn't installed)
+    """
+    sources = get_sources()
+    folders = [source for source in sources if source.get("library_path")]
+
+    # One connection per server, shared by its libraries
+    servers = {}
+    for source in sources:
+        if not source.get("library_path"):
+            servers.setdefault((source["base_url"], source["api_key"]), []).append(source)
+
+    if servers and socketio is None:
+        print('Listener mode needs python-socketio: pip install "python-socketio[client]"')
+        log_error("listener", "python-socketio is not installed")
+        return 1
+
+    queue = RefreshQueue(LISTENER_DEBOUNCE_SECONDS if debounce is None else debounce)
+    stop = threading.Event()
+
+    clients = []
+    try:
+        for source in folders:
+            threading.Thread(target=_watch, args=(source, queue, stop), daemon=True).start()
+        for server_sources in servers.values():
+            clients.append(_connect(server_sources, queue))
+
+        while True:
+            # Refreshes in quick succession share one write of next_books.json;
+            # what they held back is written once the queue has been idle a while
+            due = queue.wait_due(timeout=CACHE_WRITE_INTERVAL or None)
+            if not due:
+                try:
+                    flush_pending_writes()
+                except OSError as e:
+                    log_error("listener", f"Writing the cache failed: {e}")
+            for series_id, series_name, source in due:
+                _refresh(series_id, series_name, source)
+    except KeyboardInterrupt:
+        print("\nStopped listening")
+    finally:
+        stop.set()
+        for client in clients:
+            client.disconnect()
+        log("listener", f"Stopped - {queue.events} events, {queue.refreshes} series refreshed")
+
+    return 0
+
+
+if __name__ == "__main__":
+    # Test the module
+    raise SystemExit(run_listener())
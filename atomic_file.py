@@ -0,0 +1,56 @@
+"""Crash-safe file writes (temporary file, fsync, rename)."""
+
+import os
+import tempfile
+
+
+# Process umask, for the permissions of newly created files (read once -
+# os.umask() can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path: str, raw: bytes) -> None:
+    """
+    Replace a file's contents so readers (and crashes) only ever see the old or the new file.
+
+    The data goes to a temporary file in the same directory, is fsynced and
+    then renamed over the target.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    # mkstemp creates the file private (0600) - keep the permissions the file
+    # had, or give a new file the ones open() would
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o666 & ~_UMASK
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), mode)
+            else:
+                os.chmod(temp_path, mode)
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        # Including KeyboardInterrupt - never leave the temp file behind
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # Make the rename itself durable (not possible on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
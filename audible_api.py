@@ -1,20 +1,382 @@
 """Audible API client for fetching product and series data."""
 
+import asyncio
 import os
+import random
 import audible
+import httpx
+import config
+from audible.exceptions import RequestError, StatusError, NotFoundError, NotResponding, NetworkError
+from audible.exceptions import AuthFlowError, NoRefreshToken
 from typing import Optional
 from config import AUDIBLE_AUTH_FILE
+from logger import log
+from audible_cache import get_cached_response, store_response, get_cache_stats, close_cache
+from rate_limiter import RateLimiter, parse_retry_after
+from circuit_breaker import CircuitBreaker, CircuitOpenError
 
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 AUTH_PATH = os.path.join(SCRIPT_DIR, AUDIBLE_AUTH_FILE)
 
+# Keep-alive pool for the shared client. Connections idle longer than
+# keepalive_expiry are dropped and reopened on the next request.
+CLIENT_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60)
 
-def get_client() -> audible.Client:
-    """Create an authenticated Audible client."""
-    auth = audible.Authenticator.from_file(AUTH_PATH)
-    return audible.Client(auth=auth)
+# Most ASINs 1.0/catalog/products accepts in a single asins lookup
+PRODUCTS_BATCH_SIZE = 50
+
+# Response groups requested for every product lookup
+PRODUCT_RESPONSE_GROUPS = "series,product_attrs,media"
+
+# Page size and page limit for the catalog title search fallback
+SEARCH_PAGE_SIZE = 50
+SEARCH_MAX_PAGES = 5
+
+# Starting (and maximum) request rate to Audible, in requests per second.
+# The limiter backs off on 429/503 responses and creeps back up afterwards.
+AUDIBLE_RATE_LIMIT = getattr(config, "AUDIBLE_RATE_LIMIT", 10)
+
+# Retries for throttled, timed-out or 5xx requests, and the base backoff in seconds
+MAX_RETRIES = getattr(config, "AUDIBLE_MAX_RETRIES", 4)
+RETRY_BACKOFF = 1.0
+
+# Status codes that mean "slow down" rather than "failed"
+THROTTLE_STATUSES = (429, 503)
+
+# Consecutive failed requests before the Audible circuit opens, and seconds
+# before a probe request is let through again
+BREAKER_FAILURE_THRESHOLD = getattr(config, "BREAKER_FAILURE_THRESHOLD", 5)
+BREAKER_RESET_SECONDS = getattr(config, "BREAKER_RESET_SECONDS", 60)
+
+
+class AudibleLookupError(Exception):
+    """Raised when an Audible request fails for good (after any retries)."""
+
+
+class AudibleUnavailableError(AudibleLookupError):
+    """Raised without making a request while the Audible circuit is open."""
+
+# Shared client state - opened lazily by get_client(), released by close_client().
+# The async client is bound to _loop, which run_sync() keeps alive between calls
+# so synchronous callers share the same connection pool.
+_auth = None
+_client = None
+_loop = None
+_stats = {"requests": 0, "connections_opened": 0, "retries": 0}
+_limiter = RateLimiter(AUDIBLE_RATE_LIMIT)
+_breaker = CircuitBreaker("Audible", BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+
+# Single-flight table for this run: ("product" | "series", asin) -> future/task.
+# Later lookups of the same ASIN await the first one instead of re-requesting.
+_inflight = {}
+_dedup_stats = {"product": 0, "series": 0}
+
+# Products fetched vs kept by each series membership strategy this run
+_strategy_stats = {
+    "relationships": {"fetched": 0, "kept": 0},
+    "title_search": {"fetched": 0, "kept": 0},
+}
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace hook - counts new TCP connections opened by the pool."""
+    if event_name == "connection.connect_tcp.complete":
+        _stats["connections_opened"] += 1
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared client's event loop and return its result.
+
+    Must not be called from inside a running event loop - await the
+    coroutine directly there instead.
+    """
+    global _loop
+
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+
+    return _loop.run_until_complete(coro)
+
+
+def get_client() -> audible.AsyncClient:
+    """
+    Get the shared authenticated Audible client.
+
+    The client (and its connection pool) is created on first use and reused
+    by every call until close_client() is called. The auth file is only read
+    once per process.
+    """
+    global _auth, _client
+
+    if _client is None:
+        if _auth is None:
+            _auth = audible.Authenticator.from_file(AUTH_PATH)
+        _client = audible.AsyncClient(auth=_auth, limits=CLIENT_LIMITS)
+        log("audible", "Audible client opened")
+
+    return _client
+
+
+def _is_retryable(error: RequestError) -> bool:
+    """Timeouts, network errors, throttling and 5xx responses are worth retrying."""
+    if isinstance(error, (NotResponding, NetworkError)):
+        return True
+    return isinstance(error, StatusError) and (error.code in THROTTLE_STATUSES or error.code >= 500)
+
+
+async def _get(path: str, **params) -> dict:
+    """
+    Send a GET request through the shared client, tracking connection reuse.
+
+    Responses are served from (and saved to) the on-disk response cache.
+    Requests go through the shared rate limiter; throttled, timed-out and
+    5xx requests are retried with jittered exponential backoff, waiting at
+    least as long as any Retry-After header asks. A 404 is returned as an
+    empty response. Requests that fail for good count towards opening the
+    Audible circuit breaker; while it is open no request is made at all.
+
+    Raises:
+        AudibleUnavailableError: If the Audible circuit is open
+        AudibleLookupError: If the request still fails after all retries
+    """
+    cached = get_cached_response(path, params)
+    if cached is not None:
+        return cached
+
+    try:
+        _breaker.check()
+    except CircuitOpenError as e:
+        raise AudibleUnavailableError(str(e)) from None
+
+    try:
+        response = await _get_with_retries(path, **params)
+    except AudibleLookupError:
+        _breaker.record_failure()
+        raise
+
+    _breaker.record_success()
+    store_response(path, params, response)
+    return response
+
+
+async def _get_with_retries(path: str, **params) -> dict:
+    """Rate-limited GET with jittered backoff - the retry loop behind _get()."""
+    for attempt in range(MAX_RETRIES + 1):
+        await _limiter.acquire()
+        _stats["requests"] += 1
+
+        try:
+            response = await get_client().get(path, extensions={"trace": _trace}, **params)
+        except NotFoundError:
+            _limiter.on_success()
+            return {}
+        except RequestError as e:
+            retry_after = None
+            if isinstance(e, StatusError):
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                if e.code in THROTTLE_STATUSES:
+                    _limiter.on_throttle(retry_after)
+
+            if not _is_retryable(e) or attempt == MAX_RETRIES:
+                raise AudibleLookupError(f"GET {path} failed: {e}") from e
+
+            # Other requests tripped the breaker meanwhile - stop retrying
+            if _breaker.is_open():
+                raise AudibleUnavailableError(f"GET {path} abandoned - Audible circuit is open") from e
+
+            delay = max(random.uniform(0, RETRY_BACKOFF * 2 ** attempt), retry_after or 0)
+            _stats["retries"] += 1
+            log("audible", f"Retrying GET {path} in {delay:.1f}s (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(delay)
+            continue
+        except (httpx.HTTPError, AuthFlowError, NoRefreshToken) as e:
+            # Transport errors audible doesn't wrap, and failed token refreshes
+            raise AudibleLookupError(f"GET {path} failed: {e}") from e
+
+        # audible hands back the body as text when it isn't JSON
+        if not isinstance(response, dict):
+            raise AudibleLookupError(f"GET {path} returned a non-JSON response: {str(response)[:100]!r}")
+
+        _limiter.on_success()
+        return response
+
+
+def get_breaker_stats() -> dict:
+    """Get the Audible circuit breaker's state (state, failures, rejected)."""
+    return _breaker.get_stats()
+
+
+def get_limiter_stats() -> dict:
+    """
+    Get the Audible rate limiter's state for the current run.
+
+    Returns:
+        Dict with rate (requests/second), throttle_events, wait_time and retries
+    """
+    return {**_limiter.get_stats(), "retries": _stats["retries"]}
+
+
+def get_client_stats() -> dict:
+    """
+    Get connection counts for the current run.
+
+    Returns:
+        Dict with requests, connections_opened and connections_reused
+    """
+    return {
+        "requests": _stats["requests"],
+        "connections_opened": _stats["connections_opened"],
+        "connections_reused": max(_stats["requests"] - _stats["connections_opened"], 0)
+    }
+
+
+def close_client() -> None:
+    """
+    Close the shared client and log this run's connection and cache counts.
+
+    Safe to call when no client was opened. The next get_client() call opens
+    a fresh client, so long-running processes can call this between runs.
+    """
+    global _client, _loop
+
+    if _client is not None:
+        stats = get_client_stats()
+        run_sync(_client.close())
+        _client = None
+        log("audible", f"Audible client closed - {stats['requests']} requests, "
+                       f"{stats['connections_opened']} connections opened, "
+                       f"{stats['connections_reused']} reused")
+
+    if _loop is not None:
+        _loop.close()
+        _loop = None
+
+    end_run()
+
+    cache_stats = get_cache_stats()
+    if cache_stats["hits"] or cache_stats["misses"]:
+        log("audible", f"Audible cache - {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                       f"({cache_stats['expired']} expired), {cache_stats['evicted']} evicted")
+    close_cache()
+
+    _stats["requests"] = 0
+    _stats["connections_opened"] = 0
+
+
+def end_run() -> None:
+    """
+    Forget this run's coalesced lookups, logging and resetting its per-run counters.
+
+    The client stays open. Long-running processes call this after each
+    unit of work, so the next one asks Audible (or the response cache)
+    again instead of reusing earlier results from the single-flight table.
+    """
+    deduplicated = _dedup_stats["product"] + _dedup_stats["series"]
+    if deduplicated:
+        log("audible", f"Coalesced {deduplicated} duplicate lookups ({_dedup_stats['series']} series, "
+                       f"{_dedup_stats['product']} products)")
+    _inflight.clear()
+    _dedup_stats["product"] = 0
+    _dedup_stats["series"] = 0
+
+    for strategy, counts in _strategy_stats.items():
+        if counts["fetched"]:
+            log("audible", f"Series strategy {strategy} - {counts['fetched']} products fetched, {counts['kept']} kept")
+        counts["fetched"] = 0
+        counts["kept"] = 0
+
+    _stats["retries"] = 0
+    _limiter.reset_stats()
+
+
+async def _fetch_product_batch(asins: list[str]) -> list[Optional[dict]]:
+    """Fetch one batch of products, returning them in the order of asins."""
+    response = await _get(
+        "1.0/catalog/products",
+        asins=",".join(asins),
+        response_groups=PRODUCT_RESPONSE_GROUPS
+    )
+
+    by_asin = {p.get("asin"): p for p in response.get("products", [])}
+    return [by_asin.get(asin) for asin in asins]
+
+
+async def get_products_async(asins: list[str]) -> list[Optional[dict]]:
+    """
+    Fetch product details for many ASINs with as few requests as possible.
+
+    ASINs are split into batches of PRODUCTS_BATCH_SIZE and the batches are
+    fetched concurrently on the shared client. ASINs already looked up (or
+    being looked up) this run are not requested again.
+
+    Args:
+        asins: Book ASINs to look up
+
+    Returns:
+        List with one entry per input ASIN, in the same order: the product
+        data dict, or None if the product was not found
+
+    Raises:
+        AudibleLookupError: If any batch could not be fetched
+    """
+    if not asins:
+        return []
+
+    # Reuse lookups already in flight or finished this run; fetch the rest
+    loop = asyncio.get_running_loop()
+    futures = []
+    missing = []
+    for asin in asins:
+        future = _inflight.get(("product", asin))
+        if future is None:
+            future = loop.create_future()
+            _inflight[("product", asin)] = future
+            missing.append(asin)
+        else:
+            _dedup_stats["product"] += 1
+        futures.append(future)
+
+    if missing:
+        await _fetch_missing_products(missing)
+
+    products = await asyncio.gather(*futures, return_exceptions=True)
+    for product in products:
+        if isinstance(product, BaseException):
+            raise product
+    return products
+
+
+async def _fetch_missing_products(asins: list[str]) -> None:
+    """Fetch products in batches and resolve their single-flight futures."""
+    batches = [asins[i:i + PRODUCTS_BATCH_SIZE] for i in range(0, len(asins), PRODUCTS_BATCH_SIZE)]
+    results = await asyncio.gather(*(_fetch_product_batch(batch) for batch in batches), return_exceptions=True)
+
+    for batch, result in zip(batches, results):
+        for i, asin in enumerate(batch):
+            future = _inflight[("product", asin)]
+            if isinstance(result, BaseException):
+                # Don't remember failures - a later caller may try again
+                del _inflight[("product", asin)]
+                future.set_exception(result)
+            else:
+                future.set_result(result[i])
+
+
+def get_products(asins: list[str]) -> list[Optional[dict]]:
+    """Synchronous wrapper for get_products_async(); failed lookups come back as None."""
+    try:
+        return run_sync(get_products_async(asins))
+    except AudibleLookupError as e:
+        print(f"Error fetching products {', '.join(asins)}: {e}")
+        return [None] * len(asins)
+
+
+async def get_product_async(asin: str) -> Optional[dict]:
+    """Async version of get_product()."""
+    return (await get_products_async([asin]))[0]
 
 
 def get_product(asin: str) -> Optional[dict]:
@@ -30,18 +392,7 @@ def get_product(asin: str) -> Optional[dict]:
     Returns:
         Product data dict or None if not found
     """
-    try:
-        with get_client() as client:
-            response = client.get(
-                "1.0/catalog/products",
-                asins=[asin],
-                response_groups="series,product_attrs,media"
-            )
-            products = response.get("products", [])
-            return products[0] if products else None
-    except Exception as e:
-        print(f"Error fetching product {asin}: {e}")
-        return None
+    return get_products([asin])[0]
 
 
 def get_series_from_product(product: dict) -> list[dict]:
@@ -107,7 +458,77 @@ def get_series_from_product(product: dict) -> list[dict]:
     return series_list
 
 
-def get_series_products(series_asin: str) -> list[dict]:
+def _sort_key(component: dict) -> tuple:
+    """Order series components by their numeric sort value, unparsable ones last."""
+    try:
+        return (0, float(component.get("sort") or 0))
+    except (ValueError, TypeError):
+        return (1, 0.0)
+
+
+async def get_series_components_async(series_asin: str) -> list[dict]:
+    """
+    List the member books of a series from the series product's relationships.
+
+    Concurrent and repeated calls for the same series in one run share a
+    single request.
+
+    Args:
+        series_asin: The series ASIN
+
+    Returns:
+        List of dicts with: asin, sequence, sort - ordered by sort
+
+    Raises:
+        AudibleLookupError: If the series could not be fetched
+    """
+    key = ("series", series_asin)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_series_components(series_asin))
+        _inflight[key] = task
+    else:
+        _dedup_stats["series"] += 1
+
+    try:
+        return await task
+    except AudibleLookupError:
+        # Don't remember failures - a later caller may try again
+        if _inflight.get(key) is task:
+            del _inflight[key]
+        raise
+
+
+async def _fetch_series_components(series_asin: str) -> list[dict]:
+    """Request a series product and extract its components, ordered by sort."""
+    response = await _get(
+        f"1.0/catalog/products/{series_asin}",
+        response_groups="product_attrs,relationships"
+    )
+
+    product = response.get("product", {})
+
+    # For a series ASIN, the child relationships are the books
+    components = []
+    for rel in product.get("relationships", []):
+        if rel.get("relationship_type") not in ("component", "series"):
+            continue
+        if rel.get("relationship_type") == "series" and rel.get("relationship_to_product") != "child":
+            continue
+        if not rel.get("asin"):
+            continue
+
+        components.append({
+            "asin": rel.get("asin"),
+            "sequence": rel.get("sequence", ""),
+            "sort": rel.get("sort", "0")
+        })
+
+    components.sort(key=_sort_key)
+    return components
+
+
+async def get_series_products_async(series_asin: str) -> list[dict]:
     """
     Fetch all products in a series by the series ASIN.
 
@@ -117,59 +538,34 @@ def get_series_products(series_asin: str) -> list[dict]:
     Returns:
         List of product dicts with basic info
     """
+    components = await get_series_components_async(series_asin)
+
+    # If we got books from relationships, fetch their details in batches
+    if components:
+        products = await get_products_async([c["asin"] for c in components])
+        return [book_data for book_data in products if book_data]
+
+    return []
+
+
+def get_series_products(series_asin: str) -> list[dict]:
+    """Synchronous wrapper for get_series_products_async(); a failed lookup returns []."""
     try:
-        with get_client() as client:
-            response = client.get(
-                f"1.0/catalog/products/{series_asin}",
-                response_groups="product_attrs,media,series"
-            )
-            product = response.get("product", {})
-
-            # For a series ASIN, the relationships contain the books
-            books = []
-            for rel in product.get("relationships", []):
-                if rel.get("relationship_type") == "component":
-                    books.append({
-                        "asin": rel.get("asin"),
-                        "sort": rel.get("sort", "0")
-                    })
-
-            # If we got books from relationships, fetch their details
-            if books:
-                detailed_books = []
-                for book in books:
-                    book_data = get_product(book["asin"])
-                    if book_data:
-                        detailed_books.append(book_data)
-                return detailed_books
-
-            return []
-    except Exception as e:
+        return run_sync(get_series_products_async(series_asin))
+    except AudibleLookupError as e:
         print(f"Error fetching series {series_asin}: {e}")
         return []
 
 
-def search_series_books(series_name: str, sample_asin: str) -> list[dict]:
+def _pick_target_series(product: dict, series_name: str) -> Optional[dict]:
     """
-    Find all books in a series starting from a sample book ASIN.
-
-    Strategy:
-    1. Get the sample product to find the series ASIN
-    2. Use the series ASIN to get all books in the series
+    Pick the Audible series of a product that matches an ABS series name.
 
-    Args:
-        series_name: Name of the series (for matching)
-        sample_asin: ASIN of a book we own in this series
+    Falls back to the product's first series when no title matches.
 
     Returns:
-        List of dicts with: asin, title, sequence, cover_url
+        Series dict with: asin, title, sequence - or None if there is none
     """
-    # Get the sample product
-    product = get_product(sample_asin)
-    if not product:
-        return []
-
-    # Find the matching series
     series_info = get_series_from_product(product)
     target_series = None
 
@@ -184,46 +580,196 @@ def search_series_books(series_name: str, sample_asin: str) -> list[dict]:
         target_series = series_info[0]
 
     if not target_series or not target_series.get("asin"):
+        return None
+
+    return target_series
+
+
+def _collect_series_books(products: list[dict], target_series: dict) -> list[dict]:
+    """
+    Keep the products that belong to target_series, sorted by sequence.
+
+    Returns:
+        List of dicts with: asin, title, sequence, cover_url, issue_date
+    """
+    results = []
+    for item in products:
+        # Verify this book is actually in the series
+        item_series = get_series_from_product(item)
+        for s in item_series:
+            if s.get("asin") == target_series["asin"]:
+                # Get cover image from product_images in response
+                images = item.get("product_images", {})
+                cover_url = images.get("500", "")
+
+                results.append({
+                    "asin": item.get("asin"),
+                    "title": item.get("title"),
+                    "sequence": s.get("sequence", 0),
+                    "cover_url": cover_url,
+                    "issue_date": item.get("issue_date", "")
+                })
+                break
+
+    # Sort by sequence
+    results.sort(key=lambda x: x["sequence"])
+    return results
+
+
+async def resolve_series_async(series_name: str, sample_asin: str) -> Optional[dict]:
+    """
+    Find the Audible series an owned book belongs to.
+
+    Args:
+        series_name: Name of the series (for matching)
+        sample_asin: ASIN of a book we own in this series
+
+    Returns:
+        Series dict with: asin, title, sequence - or None if not found
+
+    Raises:
+        AudibleLookupError: If Audible could not be queried
+    """
+    product = await get_product_async(sample_asin)
+    if not product:
+        return None
+
+    return _pick_target_series(product, series_name)
+
+
+async def get_component_books_async(components: list[dict], target_series: dict) -> list[dict]:
+    """
+    Fetch details for some of a series' components and keep the real members.
+
+    Args:
+        components: Component dicts from get_series_components_async()
+        target_series: Series dict with at least asin and title
+
+    Returns:
+        List of dicts with: asin, title, sequence, cover_url, issue_date
+
+    Raises:
+        AudibleLookupError: If Audible could not be queried
+    """
+    products = await get_products_async([c["asin"] for c in components])
+    products = [p for p in products if p]
+    results = _collect_series_books(products, target_series)
+
+    _strategy_stats["relationships"]["fetched"] += len(products)
+    _strategy_stats["relationships"]["kept"] += len(results)
+    return results
+
+
+async def _series_books_from_relationships(target_series: dict) -> list[dict]:
+    """Membership strategy 1: the series product's component list."""
+    components = await get_series_components_async(target_series["asin"])
+    if not components:
         return []
 
-    # Search for products in this series
-    # Note: Audible API doesn't have a direct "get all books in series" endpoint
-    # We'll use catalog search instead
+    return await get_component_books_async(components, target_series)
+
+
+async def search_series_by_title_async(target_series: dict) -> list[dict]:
+    """
+    Membership strategy 2: page through a catalog search for the series title.
+
+    Args:
+        target_series: Series dict with at least asin and title
+
+    Returns:
+        List of dicts with: asin, title, sequence, cover_url, issue_date
+
+    Raises:
+        AudibleLookupError: If Audible could not be queried
+    """
+    products = []
+
+    for page in range(SEARCH_MAX_PAGES):
+        response = await _get(
+            "1.0/catalog/products",
+            num_results=SEARCH_PAGE_SIZE,
+            page=page,
+            products_sort_by="Relevance",
+            title=target_series["title"],
+            response_groups=PRODUCT_RESPONSE_GROUPS
+        )
+        page_products = response.get("products", [])
+        products.extend(page_products)
+
+        total = response.get("total_results", 0)
+        if len(page_products) < SEARCH_PAGE_SIZE or (total and len(products) >= total):
+            break
+
+    results = _collect_series_books(products, target_series)
+
+    _strategy_stats["title_search"]["fetched"] += len(products)
+    _strategy_stats["title_search"]["kept"] += len(results)
+    return results
+
+
+async def get_series_books_async(target_series: dict) -> list[dict]:
+    """
+    List the books in an Audible series.
+
+    Uses the series product's own component list, and only falls back to a
+    (paginated) catalog search by series title when that comes back empty.
+
+    Args:
+        target_series: Series dict with at least asin and title
+
+    Returns:
+        List of dicts with: asin, title, sequence, cover_url, issue_date
+
+    Raises:
+        AudibleLookupError: If Audible could not be queried
+    """
+    results = await _series_books_from_relationships(target_series)
+    if results:
+        return results
+
+    return await search_series_by_title_async(target_series)
+
+
+def get_dedup_stats() -> dict:
+    """Get how many product and series lookups were coalesced this run."""
+    return dict(_dedup_stats)
+
+
+def get_strategy_stats() -> dict:
+    """Get products fetched vs kept by each series membership strategy this run."""
+    return {strategy: dict(counts) for strategy, counts in _strategy_stats.items()}
+
+
+async def search_series_books_async(series_name: str, sample_asin: str) -> list[dict]:
+    """
+    Find all books in a series starting from a sample book ASIN.
+
+    Strategy:
+    1. Get the sample product to find the series ASIN
+    2. Use the series ASIN to get all books in the series
+
+    Args:
+        series_name: Name of the series (for matching)
+        sample_asin: ASIN of a book we own in this series
+
+    Returns:
+        List of dicts with: asin, title, sequence, cover_url
+
+    Raises:
+        AudibleLookupError: If Audible could not be queried
+    """
+    target_series = await resolve_series_async(series_name, sample_asin)
+    if not target_series:
+        return []
+
+    return await get_series_books_async(target_series)
+
+
+def search_series_books(series_name: str, sample_asin: str) -> list[dict]:
+    """Synchronous wrapper for search_series_books_async(); a failed lookup returns []."""
     try:
-        with get_client() as client:
-            # Search by series title
-            response = client.get(
-                "1.0/catalog/products",
-                num_results=50,
-                products_sort_by="Relevance",
-                title=target_series["title"],
-                response_groups="series,product_attrs,media"
-            )
-
-            results = []
-            for item in response.get("products", []):
-                # Verify this book is actually in the series
-                item_series = get_series_from_product(item)
-                for s in item_series:
-                    if s.get("asin") == target_series["asin"]:
-                        # Get cover image from product_images in response
-                        images = item.get("product_images", {})
-                        cover_url = images.get("500", "")
-
-                        results.append({
-                            "asin": item.get("asin"),
-                            "title": item.get("title"),
-                            "sequence": s.get("sequence", 0),
-                            "cover_url": cover_url,
-                            "issue_date": item.get("issue_date", "")
-                        })
-                        break
-
-            # Sort by sequence
-            results.sort(key=lambda x: x["sequence"])
-            return results
-
-    except Exception as e:
+        return run_sync(search_series_books_async(series_name, sample_asin))
+    except AudibleLookupError as e:
         print(f"Error searching series '{series_name}': {e}")
         return []
 
@@ -246,6 +792,10 @@ if __name__ == "__main__":
             for book in books:
                 print(f"  #{book['sequence']}: {book['title']} | Cover: {'YES' if book.get('cover_url') else 'NO'} | Issue: {book.get('issue_date', 'N/A')}")
 
+    print(f"\nConnections: {get_client_stats()}")
+    print(f"Rate limiter: {get_limiter_stats()}")
+    close_client()
+
 
 
 
@@ -0,0 +1,223 @@
+"""Persistent on-disk cache for Audible API responses."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+import config
+from logger import log, log_error
+
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(SCRIPT_DIR, getattr(config, "AUDIBLE_CACHE_FILE", "audible_cache.sqlite"))
+
+# Total size of cached response bodies before least recently used entries are evicted
+CACHE_MAX_BYTES = getattr(config, "AUDIBLE_CACHE_MAX_MB", 50) * 1024 * 1024
+
+# How long each kind of response stays fresh, in seconds
+CACHE_TTLS = {
+    "product": 7 * 24 * 3600,   # Book metadata by ASIN - rarely changes
+    "series": 24 * 3600,        # Series listings - new books get added
+    "search": 12 * 3600,        # Catalog searches - relevance results drift
+}
+
+# Cache state - the database is opened lazily on first use
+_enabled = getattr(config, "AUDIBLE_CACHE_ENABLED", True)
+_db = None
+_total_bytes = 0
+_stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Turn the response cache on or off for this process (e.g. --no-cache)."""
+    global _enabled
+    _enabled = enabled
+
+
+def _get_db() -> sqlite3.Connection:
+    """Open the cache database, creating the table on first use."""
+    global _db, _total_bytes
+
+    if _db is None:
+        _db = sqlite3.connect(CACHE_PATH, isolation_level=None)
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        _db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        _total_bytes = _db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    return _db
+
+
+def _endpoint_kind(path: str, params: dict) -> str:
+    """Classify a request as a product lookup, series listing or search."""
+    if path.rstrip("/") == "1.0/catalog/products":
+        return "product" if "asins" in params else "search"
+    return "series"
+
+
+def _cache_key(path: str, params: dict) -> str:
+    """Build a stable key from the endpoint and its parameters (incl. response_groups)."""
+    raw = json.dumps({"path": path, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(path: str, params: dict) -> Optional[dict]:
+    """
+    Look up a cached response.
+
+    Args:
+        path: API path that was requested
+        params: Query parameters that were sent
+
+    Returns:
+        The cached response, or None if caching is off or the entry is missing or stale
+    """
+    if not _enabled:
+        return None
+
+    try:
+        db = _get_db()
+        key = _cache_key(path, params)
+        row = db.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is None:
+            _stats["misses"] += 1
+            return None
+
+        if row[1] <= now:
+            _delete(db, key)
+            _stats["expired"] += 1
+            _stats["misses"] += 1
+            return None
+
+        db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        _stats["hits"] += 1
+        return json.loads(row[0])
+    except (sqlite3.Error, json.JSONDecodeError) as e:
+        log_error("cache", f"Cache read failed: {e}")
+        return None
+
+
+def store_response(path: str, params: dict, response: dict) -> None:
+    """
+    Store a response, evicting least recently used entries above CACHE_MAX_BYTES.
+
+    Args:
+        path: API path that was requested
+        params: Query parameters that were sent
+        response: Decoded response body
+    """
+    global _total_bytes
+
+    if not _enabled:
+        return
+
+    try:
+        db = _get_db()
+        key = _cache_key(path, params)
+        kind = _endpoint_kind(path, params)
+        body = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+
+        _delete(db, key)
+        db.execute(
+            "INSERT INTO responses (key, kind, body, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, kind, body, len(body), now + CACHE_TTLS[kind], now)
+        )
+        _total_bytes += len(body)
+
+        _evict(db)
+    except sqlite3.Error as e:
+        log_error("cache", f"Cache write failed: {e}")
+
+
+def _delete(db: sqlite3.Connection, key: str) -> None:
+    """Remove one entry and keep the running size total in step."""
+    global _total_bytes
+
+    row = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+    if row:
+        db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        _total_bytes -= row[0]
+
+
+def _evict(db: sqlite3.Connection) -> None:
+    """Drop least recently used entries until the cache fits in CACHE_MAX_BYTES."""
+    global _total_bytes
+
+    while _total_bytes > CACHE_MAX_BYTES:
+        rows = db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 100").fetchall()
+        if not rows:
+            _total_bytes = 0
+            break
+
+        for key, size in rows:
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            _total_bytes -= size
+            _stats["evicted"] += 1
+            if _total_bytes <= CACHE_MAX_BYTES:
+                break
+
+
+def purge_cache() -> int:
+    """
+    Delete every cached response.
+
+    Returns:
+        Number of entries removed
+    """
+    global _total_bytes
+
+    db = _get_db()
+    count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    db.execute("DELETE FROM responses")
+    db.execute("VACUUM")
+    _total_bytes = 0
+
+    log("cache", f"Audible response cache purged - {count} entries removed")
+    return count
+
+
+def get_cache_stats() -> dict:
+    """
+    Get cache counters for the current run.
+
+    Returns:
+        Dict with hits, misses, expired, evicted and the cached size in bytes
+    """
+    return {**_stats, "bytes": _total_bytes}
+
+
+def close_cache() -> None:
+    """Close the cache database and reset this run's counters."""
+    global _db
+
+    if _db is not None:
+        _db.close()
+        _db = None
+
+    for key in _stats:
+        _stats[key] = 0
+
+
+if __name__ == "__main__":
+    # Test the module
+    store_response("1.0/catalog/products", {"asins": "B0TEST123", "response_groups": "series"}, {"products": []})
+    print(get_cached_response("1.0/catalog/products", {"asins": "B0TEST123", "response_groups": "series"}))
+    print(get_cached_response("1.0/catalog/products", {"asins": "B0TEST123", "response_groups": "media"}))
+    print(f"Stats: {get_cache_stats()}")
+    close_cache()
@@ -1,61 +1,574 @@
 """AudioBookShelf API client for fetching library and series data."""
 
+import base64
+import codecs
+import hashlib
+import json
 import re
+import time
 import requests
-from typing import Optional
+import config
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Iterable, Iterator, Optional
 from config import ABS_BASE_URL, ABS_LIBRARY_ID, ABS_API_KEY
 from logger import log, log_error
+from circuit_breaker import CircuitBreaker
 
 
-def get_headers() -> dict:
+# Seconds to wait for AudioBookShelf to connect / respond
+ABS_TIMEOUT = getattr(config, "ABS_TIMEOUT", 30)
+
+# Retries (with exponential backoff) for failed GETs to AudioBookShelf
+ABS_RETRIES = getattr(config, "ABS_RETRIES", 3)
+
+# Series per page when listing the library, and how many pages are fetched at once
+ABS_PAGE_SIZE = getattr(config, "ABS_PAGE_SIZE", 100)
+ABS_PAGE_WORKERS = getattr(config, "ABS_PAGE_WORKERS", 4)
+
+# Bytes read from the response body at a time when streaming a series page
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Whitespace allowed between JSON tokens
+JSON_WHITESPACE = " \t\r\n"
+
+# ASIN in an Audible download's file name: _<ASIN>_LC_ (codec always starts with LC_)
+ASIN_PATH_PATTERN = re.compile(r'_([A-Z0-9]{10})_LC_', re.IGNORECASE)
+
+# A seriesName entry: "Series Name #X", "Series Name #X-Y" or "Series Name #X.Y"
+SERIES_ENTRY_PATTERN = re.compile(r'^(.+?)\s*#(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?$')
+
+# A bare series sequence: "X", "X-Y" or "X.Y"
+SEQUENCE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?$')
+
+# Distinct sequences ("1", "2.5", "1-3") whose parsed value is kept
+SEQUENCE_CACHE_SIZE = 4096
+
+# Libraries to read, each a dict with base_url, library_id and api_key (plus
+# optional name and database_path) - None means the single ABS_* settings
+ABS_SOURCES = getattr(config, "ABS_SOURCES", None)
+
+# Shared sessions per (server, API key) - opened lazily by get_session(),
+# released by close_session()
+_sessions = {}
+
+# Breakers per server - fail fast once a server has failed this many times in a row
+_breakers = {}
+
+
+def default_source() -> dict:
+    """The library configured by the single ABS_* (or LIBRARY_PATH) settings."""
+    library_path = getattr(config, "LIBRARY_PATH", "")
+    return {
+        "name": ABS_LIBRARY_ID or library_path,
+        "base_url": ABS_BASE_URL,
+        "library_id": ABS_LIBRARY_ID,
+        "api_key": ABS_API_KEY,
+        "database_path": getattr(config, "ABS_DATABASE_PATH", ""),
+        "library_path": library_path
+    }
+
+
+def get_sources() -> list[dict]:
+    """
+    Get every AudioBookShelf library to read.
+
+    Returns:
+        List of source dicts with name, base_url, library_id, api_key,
+        database_path and library_path; just default_source() unless
+        ABS_SOURCES is set
+    """
+    if not ABS_SOURCES:
+        return [default_source()]
+
+    sources = []
+    for source in ABS_SOURCES:
+        source = {**default_source(), "database_path": "", "library_path": "", **source}
+        source["name"] = source.get("name") or source["library_id"] or source["library_path"]
+        sources.append(source)
+    return sources
+
+
+def source_key(source: dict) -> str:
+    """Stable identifier of a source (server and library, or local folder) for stored state."""
+    if source.get("library_path"):
+        return f"file://{source['library_path']}"
+    return f"{source['base_url'].rstrip('/')}|{source['library_id']}"
+
+
+def get_breaker(source: Optional[dict] = None) -> CircuitBreaker:
+    """Get the circuit breaker of a source's server."""
+    base_url = (source or default_source())["base_url"]
+
+    if base_url not in _breakers:
+        name = "AudioBookShelf" if base_url == ABS_BASE_URL else f"AudioBookShelf ({base_url})"
+        _breakers[base_url] = CircuitBreaker(
+            name,
+            getattr(config, "BREAKER_FAILURE_THRESHOLD", 5),
+            getattr(config, "BREAKER_RESET_SECONDS", 60)
+        )
+    return _breakers[base_url]
+
+
+def get_headers(api_key: Optional[str] = None) -> dict:
     """Get authorization headers for API requests."""
-    return {"Authorization": f"Bearer {ABS_API_KEY}"}
+    return {"Authorization": f"Bearer {api_key or ABS_API_KEY}"}
 
 
-def fetch_library_series(limit: int = 100, page: int = 0) -> dict:
+def get_session(source: Optional[dict] = None) -> requests.Session:
+    """
+    Get the shared session for a source's server.
+
+    The session keeps connections alive between requests, asks for gzip
+    responses and retries idempotent GETs on connection errors and
+    429/5xx responses with exponential backoff (honoring Retry-After).
+
+    Args:
+        source: Library source (default default_source())
+    """
+    source = source or default_source()
+    key = (source["base_url"], source["api_key"])
+
+    if key not in _sessions:
+        retry = Retry(
+            total=ABS_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(get_headers(source["api_key"]))
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        _sessions[key] = session
+
+    return _sessions[key]
+
+
+def close_session() -> None:
+    """Close the shared AudioBookShelf sessions (new ones open on next use)."""
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
+
+def _library_url(source: Optional[dict], path: str) -> str:
+    """Build the URL of a library endpoint of a source."""
+    source = source or default_source()
+    return f"{source['base_url']}/api/libraries/{source['library_id']}/{path}"
+
+
+def fetch_library_series(limit: int = 100, page: int = 0, sort: Optional[str] = None, desc: bool = False,
+                         source: Optional[dict] = None) -> dict:
     """
     Fetch series from AudioBookShelf library.
 
     Args:
         limit: Results per page (must be > 0)
         page: Page number (0-indexed)
+        sort: Optional ABS sort key (e.g. "lastBookUpdated")
+        desc: Sort descending
+        source: Library source (default default_source())
 
     Returns:
         API response with results array and total count
+
+    Raises:
+        CircuitOpenError: If AudioBookShelf has been failing and is being skipped
+        requests.RequestException: If the request fails
     """
-    url = f"{ABS_BASE_URL}/api/libraries/{ABS_LIBRARY_ID}/series"
+    url = _library_url(source, "series")
     params = {"limit": limit, "page": page}
+    if sort:
+        params["sort"] = sort
+        params["desc"] = 1 if desc else 0
+
+    breaker = get_breaker(source)
+    breaker.check()
 
+    started = time.perf_counter()
     try:
-        response = requests.get(url, headers=get_headers(), params=params)
+        response = get_session(source).get(url, params=params, timeout=ABS_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
     except requests.RequestException as e:
-        log_error("audiobookshelf", f"API request failed: {e}")
+        breaker.record_failure()
+        log_error("audiobookshelf", f"API request failed after {time.perf_counter() - started:.2f}s: {e}")
         raise
 
+    elapsed = time.perf_counter() - started
+    log("audiobookshelf", f"Fetched series page {page} in {elapsed * 1000:.0f}ms "
+                          f"({len(response.content)} bytes, {response.headers.get('Content-Encoding', 'identity')})")
 
-def fetch_all_series() -> list:
-    """Fetch all series with pagination."""
-    all_series = []
-    page = 0
-    limit = 100
+    breaker.record_success()
+    return data
+
+
+def fetch_all_series(page_size: Optional[int] = None, workers: Optional[int] = None,
+                     source: Optional[dict] = None) -> list:
+    """
+    Fetch all series with pagination.
+
+    The first page tells us the total, so the remaining pages are then
+    fetched concurrently and merged back in page order.
+
+    Args:
+        page_size: Series per page (default ABS_PAGE_SIZE)
+        workers: Pages fetched at the same time (default ABS_PAGE_WORKERS)
+        source: Library source (default default_source())
+
+    Returns:
+        List of series objects, in the order ABS returns them
+    """
+    limit = page_size or ABS_PAGE_SIZE
+    workers = max(workers or ABS_PAGE_WORKERS, 1)
+    started = time.perf_counter()
 
     log("audiobookshelf", "Fetching series from AudioBookShelf...")
 
+    data = fetch_library_series(limit=limit, page=0, source=source)
+    all_series = list(data.get("results", []))
+    total = data.get("total", 0)
+    page_count = max(-(-total // limit), 1)
+
+    if page_count > 1 and all_series:
+        with ThreadPoolExecutor(max_workers=min(workers, page_count - 1)) as pool:
+            pages = pool.map(lambda page: fetch_library_series(limit=limit, page=page, source=source),
+                             range(1, page_count))
+            for data in pages:
+                all_series.extend(data.get("results", []))
+
+    elapsed = time.perf_counter() - started
+    log("audiobookshelf", f"Found {len(all_series)} series in library "
+                          f"({page_count} pages of {limit} in {elapsed:.2f}s, {workers} workers)")
+    return all_series
+
+
+def fetch_series_items(series_id: str, page_size: Optional[int] = None, source: Optional[dict] = None) -> list:
+    """
+    Fetch the library items (books) of a single series.
+
+    Args:
+        series_id: ABS ID of the series
+        page_size: Items per page (default ABS_PAGE_SIZE)
+        source: Library source (default default_source())
+
+    Returns:
+        List of library items in the series
+
+    Raises:
+        CircuitOpenError: If AudioBookShelf has been failing and is being skipped
+        requests.RequestException: If a request fails
+    """
+    url = _library_url(source, "items")
+    breaker = get_breaker(source)
+    limit = page_size or ABS_PAGE_SIZE
+    # ABS filters are "<group>.<base64 value>"
+    series_filter = "series." + base64.b64encode(series_id.encode("utf-8")).decode("ascii")
+    started = time.perf_counter()
+
+    items = []
+    page = 0
+    while True:
+        breaker.check()
+        try:
+            response = get_session(source).get(url, params={"filter": series_filter, "limit": limit, "page": page},
+                                               timeout=ABS_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            breaker.record_failure()
+            log_error("audiobookshelf", f"API request failed after {time.perf_counter() - started:.2f}s: {e}")
+            raise
+        breaker.record_success()
+
+        results = data.get("results", [])
+        items.extend(results)
+        if not results or len(items) >= data.get("total", 0):
+            break
+        page += 1
+
+    log("audiobookshelf", f"Fetched {len(items)} items of series {series_id} "
+                          f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return items
+
+
+def series_fingerprint(series: dict) -> str:
+    """
+    Fingerprint a series by its books' IDs and ABS updatedAt values.
+
+    Any book added to, removed from or edited in the series changes it.
+    """
+    books = sorted(f"{book.get('id', '')}:{book.get('updatedAt', '')}" for book in series.get("books", []))
+    return hashlib.sha1("|".join(books).encode("utf-8")).hexdigest()
+
+
+def fetch_updated_series(fingerprints: dict, page_size: Optional[int] = None, source: Optional[dict] = None) -> list:
+    """
+    Fetch only the series that changed since the fingerprints were taken.
+
+    Pages through the library sorted by most recently updated book, and
+    stops after the first page that contains a series whose fingerprint
+    is unchanged - everything after it was last touched even earlier.
+
+    Args:
+        fingerprints: Dict mapping series_name -> fingerprint from the last sync
+        page_size: Series per page (default ABS_PAGE_SIZE)
+        source: Library source (default default_source())
+
+    Returns:
+        List of series objects that are new or changed
+    """
+    limit = page_size or ABS_PAGE_SIZE
+    changed = []
+    fetched = 0
+    page = 0
+
+    log("audiobookshelf", "Fetching recently updated series from AudioBookShelf...")
+
     while True:
-        data = fetch_library_series(limit=limit, page=page)
+        data = fetch_library_series(limit=limit, page=page, sort="lastBookUpdated", desc=True, source=source)
         results = data.get("results", [])
-        all_series.extend(results)
+        fetched += len(results)
+
+        reached_unchanged = False
+        for series in results:
+            if fingerprints.get(series.get("name", "")) == series_fingerprint(series):
+                reached_unchanged = True
+            else:
+                changed.append(series)
 
-        # Check if we have more pages
         total = data.get("total", 0)
-        if len(all_series) >= total or not results:
+        if reached_unchanged or not results or fetched >= total:
             break
         page += 1
 
-    log("audiobookshelf", f"Found {len(all_series)} series in library")
-    return all_series
+    log("audiobookshelf", f"Found {len(changed)} new or changed series ({page + 1} pages, {fetched} series checked)")
+    return changed
+
+
+def iter_json_results(chunks: Iterator[str], meta: dict, key: str = "results") -> Iterator:
+    """
+    Incrementally decode a JSON object, yielding the items of one array member.
+
+    Only the array item currently being decoded is held as Python objects;
+    the object's other members (e.g. "total") are decoded into `meta`.
+
+    Args:
+        chunks: Iterator of decoded text chunks making up the JSON document
+        meta: Dict filled with the object's other members
+        key: Name of the array member to stream
+
+    Yields:
+        Each item of the `key` array, in order
+
+    Raises:
+        ValueError: If the document is not valid JSON or not an object
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        """Append the next chunk to the unread part of the buffer."""
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def peek() -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    def expect(allowed: str) -> str:
+        """Consume the next character, which must be one of `allowed`."""
+        nonlocal pos
+        char = peek()
+        if not char or char not in allowed:
+            raise ValueError(f"Malformed JSON: expected one of {allowed!r} at offset {pos}, got {char!r}")
+        pos += 1
+        return char
+
+    def value():
+        """Decode the next complete JSON value."""
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A number ending exactly at the chunk boundary may continue in the next chunk
+            if end == len(buffer) and not eof and fill():
+                continue
+            pos = end
+            return obj
+
+    expect("{")
+    if peek() == "}":
+        return
+
+    while True:
+        name = value()
+        expect(":")
+        if name == key:
+            expect("[")
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            meta[name] = value()
+
+        if expect(",}") == "}":
+            return
+
+
+def stream_library_series(limit: int, page: int, meta: dict, source: Optional[dict] = None) -> Iterator[dict]:
+    """
+    Stream one page of series from AudioBookShelf, one series object at a time.
+
+    Same request as fetch_library_series(), but the response body is
+    decoded as it arrives instead of being built into one JSON tree.
+
+    Args:
+        limit: Results per page (must be > 0)
+        page: Page number (0-indexed)
+        meta: Dict filled with the page's other fields (e.g. "total")
+        source: Library source (default default_source())
+
+    Yields:
+        Series objects, in the order ABS returns them
+
+    Raises:
+        CircuitOpenError: If AudioBookShelf has been failing and is being skipped
+        requests.RequestException: If the request fails
+        ValueError: If the response is not valid JSON
+    """
+    url = _library_url(source, "series")
+    params = {"limit": limit, "page": page}
+
+    breaker = get_breaker(source)
+    breaker.check()
+
+    started = time.perf_counter()
+    received = 0
+    count = 0
+
+    def body(response: requests.Response) -> Iterator[bytes]:
+        nonlocal received
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            received += len(chunk)
+            yield chunk
+
+    try:
+        with get_session(source).get(url, params=params, timeout=ABS_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            encoding = response.headers.get("Content-Encoding", "identity")
+            for series in iter_json_results(codecs.iterdecode(body(response), "utf-8"), meta):
+                count += 1
+                yield series
+    except (requests.RequestException, ValueError) as e:
+        breaker.record_failure()
+        log_error("audiobookshelf", f"API request failed after {time.perf_counter() - started:.2f}s: {e}")
+        raise
+
+    elapsed = time.perf_counter() - started
+    log("audiobookshelf", f"Streamed series page {page} in {elapsed * 1000:.0f}ms "
+                          f"({count} series, {received} bytes decoded, {encoding})")
+
+    breaker.record_success()
+
+
+def summarize_series_page(limit: int, page: int, meta: dict, source: Optional[dict] = None) -> tuple[dict, dict]:
+    """
+    Stream one page of series straight into its compact summary.
+
+    Args:
+        limit: Results per page (must be > 0)
+        page: Page number (0-indexed)
+        meta: Dict filled with the page's other fields (e.g. "total")
+        source: Library source (default default_source())
+
+    Returns:
+        Tuple of (series_dict as from build_series_dict_from_series(),
+        dict mapping series_name -> fingerprint) for the page
+    """
+    fingerprints = {}
+
+    def fingerprinted(series_iter: Iterator[dict]) -> Iterator[dict]:
+        for series in series_iter:
+            fingerprints[series.get("name", "")] = series_fingerprint(series)
+            yield series
+
+    series_dict = build_series_dict_from_series(fingerprinted(stream_library_series(limit, page, meta, source)))
+    return series_dict, fingerprints
+
+
+def fetch_series_summaries(page_size: Optional[int] = None, workers: Optional[int] = None,
+                           source: Optional[dict] = None) -> tuple[dict, dict]:
+    """
+    Fetch the whole library as compact per-series summaries.
+
+    Streaming equivalent of build_series_dict_from_series(fetch_all_series()):
+    each page is decoded one series at a time and reduced to its summary as
+    it arrives, so the raw JSON of the library is never held in memory.
+    Pages after the first are still fetched concurrently.
+
+    Args:
+        page_size: Series per page (default ABS_PAGE_SIZE)
+        workers: Pages fetched at the same time (default ABS_PAGE_WORKERS)
+        source: Library source (default default_source())
+
+    Returns:
+        Tuple of (dict mapping series_name -> {max_order, sample_asin, books},
+        dict mapping series_name -> fingerprint), both in library order
+    """
+    limit = page_size or ABS_PAGE_SIZE
+    workers = max(workers or ABS_PAGE_WORKERS, 1)
+    started = time.perf_counter()
+
+    log("audiobookshelf", "Streaming series from AudioBookShelf...")
+
+    meta = {}
+    series_dict, fingerprints = summarize_series_page(limit, 0, meta, source)
+    total = meta.get("total", 0)
+    page_count = max(-(-total // limit), 1)
+
+    if page_count > 1 and fingerprints:
+        with ThreadPoolExecutor(max_workers=min(workers, page_count - 1)) as pool:
+            pages = pool.map(lambda page: summarize_series_page(limit, page, {}, source), range(1, page_count))
+            for page_series, page_fingerprints in pages:
+                series_dict.update(page_series)
+                fingerprints.update(page_fingerprints)
+
+    elapsed = time.perf_counter() - started
+    log("audiobookshelf", f"Found {len(fingerprints)} series in library "
+                          f"({page_count} pages of {limit} in {elapsed:.2f}s, {workers} workers)")
+    return series_dict, fingerprints
 
 
 def extract_asin_from_path(path: str) -> Optional[str]:
@@ -68,9 +581,8 @@ def extract_asin_from_path(path: str) -> Optional[str]:
     if not path:
         return None
 
-    # Match pattern: _<ASIN>_LC_ (codec always starts with LC_)
     # ASIN can be alphanumeric (e.g., 1774241307, B008GV0PSM)
-    match = re.search(r'_([A-Z0-9]{10})_LC_', path, re.IGNORECASE)
+    match = ASIN_PATH_PATTERN.search(path)
     if match:
         return match.group(1)
     return None
@@ -89,22 +601,98 @@ def parse_series_info(series_name: str) -> tuple[str, float]:
     if not series_name:
         return ("", 0)
 
-    # Match pattern: "Series Name #X" or "Series Name #X-Y" or "Series Name #X.Y"
-    match = re.match(r'^(.+?)\s*#(\d+(?:\.\d+)?(?:-(\d+(?:\.\d+)?))?)$', series_name.strip())
+    match = SERIES_ENTRY_PATTERN.match(series_name.strip())
     if match:
-        name = match.group(1).strip()
-        order_str = match.group(2)
-
+        name, start, end = match.groups()
         # Handle ranges like "1-2" - take the highest
-        if '-' in order_str:
-            parts = order_str.split('-')
-            order = max(float(p) for p in parts)
+        return (name.strip(), max(float(start), float(end)) if end else float(start))
+
+    return (series_name.strip(), 0)
+
+
+@lru_cache(maxsize=SEQUENCE_CACHE_SIZE)
+def parse_sequence(sequence: Optional[str]) -> float:
+    """
+    Parse a series sequence ("1", "1.5" or a Publisher's Pack range "1-2").
+
+    Returns:
+        The sequence as a number (the highest one for ranges), or 0 if it
+        is missing or not numeric
+    """
+    if not sequence:
+        return 0
+
+    match = SEQUENCE_PATTERN.match(str(sequence).strip())
+    if not match:
+        return 0
+
+    start, end = match.groups()
+    return max(float(start), float(end)) if end else float(start)
+
+
+def _parse_series_name_field(series_name_field: str) -> tuple[tuple[str, float], ...]:
+    """Split a book's seriesName on commas into (lowercased name, order) pairs."""
+    # Same parsing as parse_series_info(), inlined as it runs for every book
+    entries = []
+    for entry in series_name_field.split(","):
+        entry = entry.strip()
+        match = SERIES_ENTRY_PATTERN.match(entry)
+        if match:
+            name, start, end = match.groups()
+            entries.append((name.strip().lower(), max(float(start), float(end)) if end else float(start)))
         else:
-            order = float(order_str)
+            entries.append((entry.lower(), 0))
+    return tuple(entries)
 
-        return (name, order)
 
-    return (series_name.strip(), 0)
+def _book_series_order(book: dict, metadata: dict, series_id: Optional[str], series_name_lower: str,
+                       parsed_fields: dict) -> float:
+    """
+    Get a book's position in one of its series.
+
+    Uses the structured sequence ABS sends with the book - the "sequence"
+    the series endpoint adds to each book, or the matching entry of the
+    metadata's series list - and only parses the seriesName string
+    ("Series A #1, Series B #3") when neither is there.
+
+    Args:
+        book: Library item from a series' books
+        metadata: The book's media metadata
+        series_id: ABS ID of the series (may be None)
+        series_name_lower: Name of the series, lowercased
+        parsed_fields: Memo of multi-series seriesName string -> parsed
+            entries, shared across one build
+
+    Returns:
+        The book's order in the series (0 if unknown)
+    """
+    if "sequence" in book:
+        return parse_sequence(book["sequence"])
+
+    for entry in metadata.get("series") or ():
+        if not isinstance(entry, dict):
+            continue
+        if (series_id and entry.get("id") == series_id) or (entry.get("name") or "").lower() == series_name_lower:
+            return parse_sequence(entry.get("sequence"))
+
+    # Fallback: find the order for THIS series in the seriesName string
+    series_name_field = metadata.get("seriesName") or ""
+    if "," in series_name_field:
+        # Only books in several series are seen more than once per build
+        entries = parsed_fields.get(series_name_field)
+        if entries is None:
+            entries = parsed_fields[series_name_field] = _parse_series_name_field(series_name_field)
+    else:
+        entries = _parse_series_name_field(series_name_field)
+
+    order = 0
+    for parsed_name, parsed_order in entries:
+        if parsed_name == series_name_lower:
+            return parsed_order
+        # Also try partial match
+        if series_name_lower in parsed_name or parsed_name in series_name_lower:
+            order = parsed_order
+    return order
 
 
 def get_book_series_data(item: dict) -> list[dict]:
@@ -149,22 +737,26 @@ def get_book_series_data(item: dict) -> list[dict]:
     return results
 
 
-def build_series_dict_from_series(series_list: list) -> dict:
+def build_series_dict_from_series(series_list: Iterable[dict]) -> dict:
     """
     Build a dictionary of series from the ABS series endpoint data.
 
     Args:
-        series_list: List of series objects from /api/libraries/<id>/series
+        series_list: Series objects from /api/libraries/<id>/series (a list,
+            or a generator such as stream_library_series())
 
     Returns:
         Dict mapping series_name -> {max_order: float, sample_asin: str, books: list}
     """
     series_dict = {}
+    parsed_fields = {}
 
     for series in series_list:
         series_name = series.get("name", "")
         if not series_name:
             continue
+        series_id = series.get("id")
+        series_name_lower = series_name.lower()
 
         books_data = []
         max_order = 0
@@ -184,20 +776,8 @@ def build_series_dict_from_series(series_list: list) -> dict:
             if not asin:
                 continue
 
-            # Get series order from seriesName field
-            series_name_field = metadata.get("seriesName", "")
-
             # Find the order for THIS series (book might be in multiple series)
-            order = 0
-            for entry in series_name_field.split(","):
-                entry = entry.strip()
-                parsed_name, parsed_order = parse_series_info(entry)
-                if parsed_name.lower() == series_name.lower():
-                    order = parsed_order
-                    break
-                # Also try partial match
-                if series_name.lower() in parsed_name.lower() or parsed_name.lower() in series_name.lower():
-                    order = parsed_order
+            order = _book_series_order(book, metadata, series_id, series_name_lower, parsed_fields)
 
             if order > max_order:
                 max_order = order
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading the ABS library over the REST API vs from its SQLite database.
+
+Builds a fixture absdatabase.sqlite and serves the same synthetic library
+from a local HTTP server, then times fetch_series_summaries() against
+fetch_series_summaries_from_database() and checks they agree.
+
+Usage:
+    python benchmarks/abs_backends.py                  # 10,000 series x 5 books
+    python benchmarks/abs_backends.py --series 2000 --books 25 --runs 5
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abs_memory import make_book, start_server
+
+LIBRARY_ID = "lib_benchmark"
+
+# The columns of AudioBookShelf's schema that the database backend reads
+FIXTURE_SCHEMA = """
+    CREATE TABLE series (id TEXT PRIMARY KEY, name TEXT, libraryId TEXT);
+    CREATE TABLE books (id TEXT PRIMARY KEY, title TEXT, asin TEXT);
+    CREATE TABLE bookSeries (id TEXT PRIMARY KEY, sequence TEXT, createdAt TEXT, bookId TEXT, seriesId TEXT);
+    CREATE TABLE libraryItems (id TEXT PRIMARY KEY, path TEXT, mediaId TEXT, mediaType TEXT,
+                               updatedAt TEXT, libraryId TEXT);
+"""
+
+
+def abs_timestamp(epoch_ms: int) -> str:
+    """Format epoch milliseconds the way AudioBookShelf stores timestamps."""
+    stamp = datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
+    return stamp.strftime("%Y-%m-%d %H:%M:%S.") + f"{epoch_ms % 1000:03d} +00:00"
+
+
+def build_fixture(path: str, series_count: int, books_per_series: int) -> None:
+    """Write a fixture database holding the same library the HTTP server serves."""
+    conn = sqlite3.connect(path)
+    conn.executescript(FIXTURE_SCHEMA)
+
+    for i in range(series_count):
+        series_id = f"ser_{i:05d}"
+        conn.execute("INSERT INTO series VALUES (?, ?, ?)", (series_id, f"Benchmark Series {i}", LIBRARY_ID))
+        for b in range(1, books_per_series + 1):
+            item = make_book(i, b)
+            book_id = item["media"]["id"]
+            metadata = item["media"]["metadata"]
+            conn.execute("INSERT INTO books VALUES (?, ?, ?)", (book_id, metadata["title"], metadata["asin"]))
+            conn.execute("INSERT INTO bookSeries VALUES (?, ?, ?, ?, ?)",
+                         (f"bs_{book_id}", str(b), abs_timestamp(item["addedAt"]), book_id, series_id))
+            conn.execute("INSERT INTO libraryItems VALUES (?, ?, ?, 'book', ?, ?)",
+                         (item["id"], item["path"], book_id, abs_timestamp(item["updatedAt"]), LIBRARY_ID))
+
+    conn.commit()
+    conn.close()
+
+
+def best_of(runs: int, func) -> tuple[float, object]:
+    """Run func `runs` times and return (fastest time in seconds, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ABS REST API vs SQLite database reads")
+    parser.add_argument("--series", type=int, default=10000, help="Series in the synthetic library")
+    parser.add_argument("--books", type=int, default=5, help="Books per series")
+    parser.add_argument("--page-size", type=int, default=100, help="Series per ABS page")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per backend (best is reported)")
+    args = parser.parse_args()
+
+    import audiobookshelf
+    from abs_database import fetch_series_summaries_from_database
+
+    audiobookshelf.ABS_BASE_URL = start_server(args.series, args.books, args.page_size)
+    print(f"Synthetic library: {args.series} series x {args.books} books = {args.series * args.books} books")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "absdatabase.sqlite")
+        build_fixture(db_path, args.series, args.books)
+
+        http_time, (http_series, http_fingerprints) = best_of(
+            args.runs, lambda: audiobookshelf.fetch_series_summaries(args.page_size))
+        db_time, (db_series, db_fingerprints) = best_of(
+            args.runs, lambda: fetch_series_summaries_from_database(db_path, LIBRARY_ID))
+
+    audiobookshelf.close_session()
+
+    print(f"  REST API  {http_time:>6.2f}s")
+    print(f"  database  {db_time:>6.2f}s  ({http_time / db_time:.1f}x faster)")
+    print(f"  Same series summaries: {http_series == db_series}, same fingerprints: {http_fingerprints == db_fingerprints}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
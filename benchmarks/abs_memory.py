@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of reading the ABS library: full JSON pages vs streaming.
+
+Serves a synthetic library from a local HTTP server and loads it in a fresh
+child process per mode, reporting how much each mode grew the process's
+peak RSS.
+
+Usage:
+    python benchmarks/abs_memory.py                 # 10,000 series x 5 books
+    python benchmarks/abs_memory.py --series 2000 --books 25
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_book(series_index: int, book_index: int) -> dict:
+    """Build a library item shaped like the ones ABS embeds in series results."""
+    asin = f"B{series_index:05d}{book_index:04d}"
+    return {
+        "id": f"li_{series_index:05d}_{book_index:04d}_8f2c4a1e9d7b",
+        "ino": str(1000000 + series_index * 100 + book_index),
+        "libraryId": "lib_benchmark",
+        "folderId": "fol_benchmark",
+        "path": f"/audiobooks/Series {series_index}/Book {book_index}_{asin}_LC_128_44100_Stereo.m4b",
+        "relPath": f"Series {series_index}/Book {book_index}_{asin}_LC_128_44100_Stereo.m4b",
+        "isFile": True,
+        "mtimeMs": 1700000000000 + book_index,
+        "ctimeMs": 1700000000000 + book_index,
+        "birthtimeMs": 1700000000000,
+        "addedAt": 1700000000000 + series_index,
+        "updatedAt": 1700000000000 + series_index + book_index,
+        "isMissing": False,
+        "isInvalid": False,
+        "mediaType": "book",
+        "media": {
+            "id": f"book_{series_index:05d}_{book_index:04d}",
+            "metadata": {
+                "title": f"Benchmark Series {series_index}, Book {book_index}",
+                "subtitle": "A Synthetic Novel",
+                "authorName": f"Author {series_index % 500}",
+                "narratorName": f"Narrator {series_index % 300}",
+                "seriesName": f"Benchmark Series {series_index} #{book_index}",
+                "genres": ["Science Fiction & Fantasy", "Fantasy"],
+                "publishedYear": "2021",
+                "publisher": "Benchmark Audio",
+                "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                "isbn": None,
+                "asin": asin,
+                "language": "English",
+                "explicit": False
+            },
+            "coverPath": f"/metadata/items/li_{series_index:05d}_{book_index:04d}/cover.jpg",
+            "tags": [],
+            "numTracks": 1,
+            "numAudioFiles": 1,
+            "numChapters": 42,
+            "duration": 43210.5,
+            "size": 612345678
+        },
+        "numFiles": 2,
+        "size": 612400000
+    }
+
+
+def make_page(series_count: int, books_per_series: int, limit: int, page: int) -> bytes:
+    """Serialize one page of the synthetic /series response."""
+    start = page * limit
+    results = [
+        {
+            "id": f"ser_{i:05d}",
+            "name": f"Benchmark Series {i}",
+            "nameIgnorePrefix": f"Benchmark Series {i}",
+            "addedAt": 1700000000000 + i,
+            "books": [make_book(i, b) for b in range(1, books_per_series + 1)]
+        }
+        for i in range(start, min(start + limit, series_count))
+    ]
+    return json.dumps({"results": results, "total": series_count, "limit": limit, "page": page}).encode("utf-8")
+
+
+def start_server(series_count: int, books_per_series: int, page_size: int) -> str:
+    """Start the synthetic ABS server in a background thread and return its base URL."""
+    # Serialize up front so page generation isn't timed as part of either mode
+    pages = {
+        (page_size, page): make_page(series_count, books_per_series, page_size, page)
+        for page in range(max(-(-series_count // page_size), 1))
+    }
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            limit = int(query.get("limit", ["100"])[0])
+            page = int(query.get("page", ["0"])[0])
+            with lock:
+                if (limit, page) not in pages:
+                    pages[(limit, page)] = make_page(series_count, books_per_series, limit, page)
+                body = pages[(limit, page)]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    # Linux keeps ru_maxrss across exec (so it includes the parent's server),
+    # VmHWM starts fresh with the child's own address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(mode: str, base_url: str, page_size: int) -> None:
+    """Load the library once in this process and print a JSON result line."""
+    import audiobookshelf
+
+    audiobookshelf.ABS_BASE_URL = base_url
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+
+    if mode == "pages":
+        series_dict = audiobookshelf.build_series_dict_from_series(audiobookshelf.fetch_all_series(page_size))
+    else:
+        series_dict, _ = audiobookshelf.fetch_series_summaries(page_size)
+
+    elapsed = time.perf_counter() - started
+    books = sum(len(data["books"]) for data in series_dict.values())
+    print(json.dumps({
+        "mode": mode,
+        "series": len(series_dict),
+        "books": books,
+        "seconds": round(elapsed, 2),
+        "baseline_mb": round(baseline, 1),
+        "peak_mb": round(peak_rss_mb(), 1)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ABS library loading memory")
+    parser.add_argument("--series", type=int, default=10000, help="Series in the synthetic library")
+    parser.add_argument("--books", type=int, default=5, help="Books per series")
+    parser.add_argument("--page-size", type=int, default=100, help="Series per ABS page")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child, args.page_size)
+        return 0
+
+    base_url = start_server(args.series, args.books, args.page_size)
+    print(f"Synthetic library: {args.series} series x {args.books} books = {args.series * args.books} books")
+
+    for mode in ("pages", "stream"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, base_url,
+             "--page-size", str(args.page_size)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {mode:<7} {result['seconds']:>6.2f}s  peak RSS {result['peak_mb']:>7.1f} MB "
+              f"(+{result['peak_mb'] - result['baseline_mb']:.1f} MB over baseline, "
+              f"{result['series']} series / {result['books']} books)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
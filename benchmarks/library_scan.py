@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark scanning a local library folder: first scan vs indexed rescans.
+
+Builds a synthetic Author/Series/book tree in a temporary directory and
+times a scan with no path index, a rescan with nothing changed, and a
+rescan after a book lands in one series.
+
+Usage:
+    python benchmarks/library_scan.py                  # 5,000 series x 5 books
+    python benchmarks/library_scan.py --series 20000 --books 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_tree(root: str, series_count: int, books_per_series: int) -> None:
+    """Create empty book files laid out as <Author>/<Series>/<NN - Book>/<file>."""
+    for i in range(series_count):
+        series_dir = os.path.join(root, f"Author {i % 500}", f"Benchmark Series {i}")
+        for b in range(1, books_per_series + 1):
+            book_dir = os.path.join(series_dir, f"{b:02d} - Book {b}")
+            os.makedirs(book_dir)
+            open(os.path.join(book_dir, f"Book {b}_B{i:05d}{b:04d}_LC_128_44100_Stereo.m4b"), "w").close()
+
+
+def timed(func) -> tuple[float, object]:
+    """Run func once and return (seconds, result)."""
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local library scans")
+    parser.add_argument("--series", type=int, default=5000, help="Series in the synthetic library")
+    parser.add_argument("--books", type=int, default=5, help="Books per series")
+    args = parser.parse_args()
+
+    import library_scanner
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "library")
+        library_scanner.INDEX_PATH = os.path.join(tmp, "library_index.json")
+        build_tree(root, args.series, args.books)
+        print(f"Synthetic library: {args.series} series x {args.books} books = {args.series * args.books} books")
+
+        cold, (_, cold_stats) = timed(lambda: library_scanner.scan_library(root))
+        warm, (_, warm_stats) = timed(lambda: library_scanner.scan_library(root))
+
+        series_dir = os.path.join(root, "Author 7", "Benchmark Series 7")
+        book_dir = os.path.join(series_dir, f"{args.books + 1:02d} - New Book")
+        os.makedirs(book_dir)
+        open(os.path.join(book_dir, f"New Book_BNEW{args.books + 1:06d}_LC_128_44100_Stereo.m4b"), "w").close()
+        changed, (_, changed_stats) = timed(lambda: library_scanner.scan_library(root))
+
+    for label, seconds, stats in (("no index", cold, cold_stats), ("unchanged", warm, warm_stats),
+                                  ("one new book", changed, changed_stats)):
+        print(f"  {label:<13} {seconds * 1000:>8.1f}ms  ({stats['listed']} of {stats['dirs']} directories listed, "
+              f"{stats['books']} books)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark build_series_dict_from_series() on a synthetic library.
+
+Times the builder on series results with ABS's structured per-book
+sequence, and on the same results with it removed (seriesName parsing only).
+
+Usage:
+    python benchmarks/series_builder.py                 # 10,000 series x 5 books
+    python benchmarks/series_builder.py --series 2000 --books 25 --runs 10
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abs_memory import make_book
+
+
+def make_library(series_count: int, books_per_series: int) -> list[dict]:
+    """Build /series results; every tenth series' books also belong to a shared universe."""
+    library = []
+    for i in range(series_count):
+        books = []
+        for b in range(1, books_per_series + 1):
+            book = make_book(i, b)
+            if i % 10 == 0:
+                book["media"]["metadata"]["seriesName"] += f", Benchmark Universe {i // 1000} #{i + b}"
+            book["sequence"] = str(b)
+            books.append(book)
+        library.append({"id": f"ser_{i:05d}", "name": f"Benchmark Series {i}", "books": books})
+    return library
+
+
+def best_of(runs: int, func) -> float:
+    """Run func `runs` times and return the fastest time in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark the series dict builder")
+    parser.add_argument("--series", type=int, default=10000, help="Series in the synthetic library")
+    parser.add_argument("--books", type=int, default=5, help="Books per series")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per case (best is reported)")
+    args = parser.parse_args()
+
+    import audiobookshelf
+
+    structured = make_library(args.series, args.books)
+    unstructured = copy.deepcopy(structured)
+    for series in unstructured:
+        for book in series["books"]:
+            del book["sequence"]
+
+    print(f"Synthetic library: {args.series} series x {args.books} books = {args.series * args.books} books")
+    for label, library in (("structured sequence", structured), ("seriesName only", unstructured)):
+        def build():
+            # Start every run with a cold sequence cache, as a sync would
+            cache_clear = getattr(audiobookshelf.__dict__.get("parse_sequence"), "cache_clear", None)
+            if cache_clear:
+                cache_clear()
+            audiobookshelf.build_series_dict_from_series(library)
+
+        print(f"  {label:<20} {best_of(args.runs, build) * 1000:>8.1f}ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
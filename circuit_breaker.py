@@ -0,0 +1,99 @@
+"""Circuit breaker for remote services (Audible, AudioBookShelf)."""
+
+import time
+from logger import log
+
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the service's breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a remote service is down.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    refuses every call. Once `reset_timeout` seconds have passed it lets a
+    single probe through (half-open): success closes the breaker again,
+    failure re-opens it for another timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.rejected = 0
+
+    def _transition(self, state: str, reason: str) -> None:
+        """Change state and log the transition."""
+        if state != self.state:
+            log("breaker", f"{self.name} circuit {self.state} -> {state} ({reason})")
+            self.state = state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN, f"{self.reset_timeout}s passed, probing")
+            self.probing = False
+
+        if self.state == CLOSED:
+            return True
+
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def is_open(self) -> bool:
+        """Return True while the breaker is open (without consuming a probe)."""
+        return self.state == OPEN
+
+    def check(self) -> None:
+        """
+        Make sure a call may be made now.
+
+        Raises:
+            CircuitOpenError: If the breaker is refusing calls
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit is open - skipping call")
+
+    def record_success(self) -> None:
+        """A call succeeded - reset the failure count and close the breaker."""
+        self.failures = 0
+        self.probing = False
+        self._transition(CLOSED, "call succeeded")
+
+    def record_failure(self) -> None:
+        """A call failed - open the breaker once the threshold is reached."""
+        self.failures += 1
+        self.probing = False
+
+        if self.state == HALF_OPEN:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN, "probe failed")
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN, f"{self.failures} consecutive failures")
+
+    def get_stats(self) -> dict:
+        """
+        Get the breaker's current state.
+
+        Returns:
+            Dict with state, consecutive failures and calls rejected
+        """
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
@@ -35,6 +35,60 @@ ABS_LIBRARY_ID = ""
 # Example: "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
 ABS_API_KEY = ""
 
+# Seconds to wait for AudioBookShelf before a request is considered failed
+ABS_TIMEOUT = 30
+
+# How many times a failed AudioBookShelf request (connection error or
+# 429/5xx response) is retried, with exponential backoff, before giving up
+ABS_RETRIES = 3
+
+# Series fetched per page when listing the library, and how many pages are
+# fetched at the same time after the first one. Tune both against your
+# server - bigger pages mean fewer requests but larger responses.
+ABS_PAGE_SIZE = 100
+ABS_PAGE_WORKERS = 4
+
+# Path to AudioBookShelf's own database, for when NewBooks runs on the same
+# host as AudioBookShelf (e.g. "/config/absdatabase.sqlite" in Docker)
+# The library is then read directly from it (read-only) instead of through
+# the REST API, which is much faster for large libraries.
+# Leave empty ("") to use the REST API.
+ABS_DATABASE_PATH = ""
+
+# Listener mode ("python main.py --listen") refreshes a series this many
+# seconds after AudioBookShelf last reported a change to one of its books,
+# so a batch of books being added is handled as a single refresh.
+# Needs the optional python-socketio package:
+#   pip install "python-socketio[client]"
+LISTENER_DEBOUNCE_SECONDS = 5
+
+# Folder holding your audiobooks, for hosts that have it mounted but don't
+# run AudioBookShelf (the ABS settings above are then not used)
+# Books are found by the ASIN in their file names (<bookname>_<ASIN>_LC_...m4b)
+# and grouped into series by folder (<Author>/<Series>/...) or by book name
+# ("Series Name, Book 3"). Only folders that changed are re-read on each run.
+# Listener mode watches the folder and refreshes a series as books land.
+# Leave empty ("") to use AudioBookShelf.
+LIBRARY_PATH = ""
+
+# Several libraries, possibly on several AudioBookShelf servers
+# Each entry needs a library_id (or a library_path for a local folder);
+# base_url and api_key default to the settings above, and name (shown in
+# messages) to the library ID or path. ABS_DATABASE_PATH is not used for
+# these entries - give an entry its own database_path to read that library
+# from AudioBookShelf's database.
+# Libraries are read concurrently and a series owned in more than one of
+# them is only looked up on Audible once.
+# Leave as None to use just the single library configured above.
+# Example:
+#   ABS_SOURCES = [
+#       {"name": "Main", "library_id": "35737281-986f-43e6-aaff-bb92e685ce6c"},
+#       {"name": "Kids", "library_id": "8d1f0a52-...", "base_url": "http://192.168.1.101:13378",
+#        "api_key": "eyJ..."},
+#       {"name": "NAS", "library_path": "/mnt/nas/audiobooks"},
+#   ]
+ABS_SOURCES = None
+
 
 # =============================================================================
 # AUDIBLE API SETTINGS
@@ -73,6 +127,46 @@ ABS_API_KEY = ""
 # The auth file contains encrypted credentials - keep it safe and never commit!
 AUDIBLE_AUTH_FILE = "audible_auth.json"
 
+# Maximum number of series looked up on Audible at the same time
+# Higher values finish large libraries faster; lower values are gentler on
+# the Audible API. Set to 1 to resolve series one after another.
+AUDIBLE_CONCURRENCY = 8
+
+# When the library is exactly as it was on the last run (same series, same
+# highest owned books), Audible lookups are skipped entirely, and series
+# whose owned books didn't change aren't looked up again. At least once
+# every this many days, series whose next book is unknown or not released
+# yet are looked up anyway, to catch newly announced or rescheduled books.
+# --force always looks up every series.
+LIBRARY_RECHECK_DAYS = 7
+
+# Maximum request rate to Audible, in requests per second
+# The rate is halved whenever Audible throttles us (HTTP 429/503) and then
+# slowly climbs back up to this value.
+AUDIBLE_RATE_LIMIT = 10
+
+# How many times a throttled, timed-out or failed (5xx) request is retried
+# before the series is reported as "lookup failed" and its cached data kept
+AUDIBLE_MAX_RETRIES = 4
+
+# Circuit breaker for Audible and AudioBookShelf outages
+# After this many consecutive failed requests to a service, remaining calls
+# to it are skipped (cached results are kept) until BREAKER_RESET_SECONDS
+# have passed and a single probe request succeeds.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 60
+
+# On-disk cache of Audible API responses (relative to this script)
+# Book details are kept for a week, series listings and searches for a day
+# or less. Run "python main.py purge-cache" to clear it, or pass --no-cache
+# to bypass it for a single run.
+AUDIBLE_CACHE_ENABLED = True
+AUDIBLE_CACHE_FILE = "audible_cache.sqlite"
+
+# Maximum size of the response cache in megabytes
+# Least recently used responses are dropped once the cache grows past this.
+AUDIBLE_CACHE_MAX_MB = 50
+
 
 # =============================================================================
 # OUTPUT SETTINGS
@@ -86,6 +180,37 @@ AUDIBLE_AUTH_FILE = "audible_auth.json"
 # The cache prevents unnecessary API calls on subsequent runs
 OUTPUT_FILE = "next_books.json"
 
+# OUTPUT_FILE is rewritten at most once per this many seconds while series
+# are being updated; changes in between are kept in memory and written with
+# the next write, at the end of a run, once listener mode has been idle
+# this long, or when the program exits. Each write goes to a temporary
+# file that replaces OUTPUT_FILE only once complete, so a crash or Ctrl-C
+# never leaves it half-written. 0 writes after every change.
+CACHE_WRITE_INTERVAL = 5
+
+# Series updates are appended, one line each, to a journal next to
+# OUTPUT_FILE (next_books.journal) instead of rewriting the whole file; it
+# also records when and why each series' next book changed. The journal is
+# read back on startup, and updates another process (e.g. listener mode)
+# appended are taken in before OUTPUT_FILE is written. Once the journal
+# grows past this many kilobytes it is folded into OUTPUT_FILE and its
+# lines move to next_books.journal.archive.
+CACHE_JOURNAL_MAX_KB = 256
+
+# Once next_books.journal.archive would grow past this many kilobytes it is
+# renamed to next_books.journal.archive.1 (replacing the previous one) and
+# a new archive is started, so the history kept is bounded. 0 keeps none.
+CACHE_JOURNAL_ARCHIVE_MAX_KB = 4096
+
+# Where the cache is kept: "json" (OUTPUT_FILE) or "sqlite"
+# With "sqlite" the cache lives in STORAGE_DATABASE_FILE (relative to this
+# script) and only changed rows are written, which is much cheaper for large
+# libraries. An existing OUTPUT_FILE is imported the first time, and it is
+# still written after every run (or with "python main.py export-json") for
+# anything that reads it.
+STORAGE_BACKEND = "json"
+STORAGE_DATABASE_FILE = "next_books.sqlite"
+
 
 # =============================================================================
 # SERIES EXCLUSIONS
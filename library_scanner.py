@@ -0,0 +1,469 @@
+"""
+Local filesystem library source, for hosts with the audiobooks mounted but no AudioBookShelf.
+
+Books are found by the ASIN in their file names (<bookname>_<ASIN>_LC_...m4b)
+and grouped into series from the folder layout or the book name:
+
+    <root>/<Author>/<Series>/<book file>
+    <root>/<Author>/<Series>/<NN - Book folder>/<book file>
+    <root>/<Series Name, Book 3>_<ASIN>_LC_...m4b
+
+A persistent path index remembers every directory's mtime and contents, so
+a rescan stats each directory but only lists the ones that changed.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+import config
+from typing import Callable, Iterator, Optional
+from logger import log, log_error
+from atomic_file import atomic_write
+from audiobookshelf import build_series_dict_from_series, series_fingerprint, ASIN_PATH_PATTERN
+
+
+# Root of a local audiobook library - empty to read AudioBookShelf instead
+LIBRARY_PATH = getattr(config, "LIBRARY_PATH", "")
+
+# Path index kept between scans, next to this script
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(SCRIPT_DIR, "library_index.json")
+
+# Files that can be books (and carry an ASIN in their name)
+AUDIO_EXTENSIONS = (".m4b", ".m4a", ".mp3", ".aax", ".aaxc")
+
+# "Book 3", "Vol. 2", "Volume 1.5" or "#4" anywhere in a name
+BOOK_NUMBER_PATTERN = re.compile(r'(?:\bbook|\bvol(?:ume)?\.?|#)\s*(\d+(?:\.\d+)?)\b', re.IGNORECASE)
+
+# "03 - Title", "3. Title" or "3_Title" at the start of a name
+LEADING_NUMBER_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*[-._)]\s*')
+
+# "Series Name, Book 3" / "Series Name: Vol 3" / "Series Name #3" - the series part
+SERIES_IN_NAME_PATTERN = re.compile(r'^(.+?)[,:]?\s+(?:book|vol(?:ume)?\.?|#)\s*\d', re.IGNORECASE)
+
+# inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Serializes read-modify-write of the index when several roots scan at once
+_index_lock = threading.Lock()
+
+
+def book_name_from_filename(filename: str) -> Optional[str]:
+    """Get the <bookname> part of "<bookname>_<ASIN>_LC_...m4b"; None without an ASIN."""
+    match = ASIN_PATH_PATTERN.search(filename)
+    if not match:
+        return None
+    return filename[:match.start()].strip(" _-") or None
+
+
+def _book_number(name: str) -> Optional[float]:
+    """Find a book number ("Book 3", "#3", "03 - ...") in a file or folder name."""
+    match = BOOK_NUMBER_PATTERN.search(name) or LEADING_NUMBER_PATTERN.match(name)
+    return float(match.group(1)) if match else None
+
+
+def parse_path_hint(dir_parts: list[str], book_name: str,
+                    folder_books: Optional[Callable[[list[str]], int]] = None) -> tuple[Optional[str], Optional[float]]:
+    """
+    Guess a book's series and position from where it lives.
+
+    A numbered innermost folder (or one named like the book) is the book's
+    own folder and only gives its number. Below an Author/Series pair the
+    series is the folder the book is in, as long as the book has a number or
+    shares that folder with other books - a lone unnumbered book in
+    Author/Title/ is a standalone. Otherwise the series has to be part of
+    the book name ("Series Name, Book 3").
+
+    Args:
+        dir_parts: Folders from the library root down to the book file
+        book_name: The <bookname> part of the file name
+        folder_books: Called with the folders down to the series folder,
+            returns how many books (and book folders) it holds; without it
+            the folder is taken to hold just this book
+
+    Returns:
+        Tuple of (series_name or None, order or None)
+    """
+    parts = list(dir_parts)
+    order = _book_number(book_name)
+
+    if parts:
+        folder = parts[-1]
+        folder_number = _book_number(folder)
+        if folder_number is not None or folder.casefold() == book_name.casefold():
+            parts.pop()
+            if order is None:
+                order = folder_number
+
+    if len(parts) >= 2 and (order is not None or (folder_books is not None and folder_books(parts) > 1)):
+        return parts[-1], order
+
+    match = SERIES_IN_NAME_PATTERN.match(book_name)
+    if match:
+        return match.group(1).strip(" -_"), order
+    return None, order
+
+
+def load_index() -> dict:
+    """Load the path index (root -> relative dir -> entry); empty if missing or unreadable."""
+    if not os.path.exists(INDEX_PATH):
+        return {}
+
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        log_error("scanner", f"Error loading path index: {e}")
+        return {}
+
+
+def save_index(index: dict) -> None:
+    """Save the path index."""
+    # json.dumps() uses the C encoder; json.dump() streams through the Python one
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+    atomic_write(INDEX_PATH, data.encode("utf-8"))
+
+
+def _list_directory(path: str) -> tuple[list[str], list[list[str]]]:
+    """List a directory's subfolders and ASIN-named audio files (hidden entries skipped)."""
+    subdirs = []
+    books = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            # Symlinked folders are not followed, so links can't loop
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                match = ASIN_PATH_PATTERN.search(entry.name)
+                if match:
+                    books.append([entry.name, match.group(1)])
+    return sorted(subdirs), sorted(books)
+
+
+def _entry_books(subdirs: list[str], books: list[list[str]]) -> int:
+    """Count the books in a listed directory: distinct ASINs plus subfolders (book folders)."""
+    return len({asin for _, asin in books}) + len(subdirs)
+
+
+def scan_library(root: Optional[str] = None) -> tuple[list[dict], dict]:
+    """
+    Find every book under a library root.
+
+    Each directory is stat'ed; only directories whose mtime changed since
+    the last scan (files or folders added, removed or renamed in them) are
+    listed again. The index is updated on disk when anything changed.
+
+    Args:
+        root: Library root (default LIBRARY_PATH)
+
+    Returns:
+        Tuple of (list of book dicts with path, asin, title, series_name
+        and order, stats dict with dirs, listed and books)
+
+    Raises:
+        OSError: If the root can't be read
+    """
+    root = os.path.abspath(root or LIBRARY_PATH)
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"Library path not found: {root}")
+
+    with _index_lock:
+        index = load_index()
+        known = index.get(root, {})
+        dirs = {}
+        books = []
+        listed = 0
+
+        def folder_books(parts: list[str]) -> int:
+            # Parents are listed before their subfolders, so this is always in dirs
+            parent = dirs.get(os.sep.join(parts))
+            return _entry_books(parent["subdirs"], parent["books"]) if parent else 1
+
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = f"{root}{os.sep}{rel}" if rel else root
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                entry = known.get(rel)
+                if entry is None or entry["mtime"] != mtime:
+                    subdirs, files = _list_directory(path)
+                    entry = {"mtime": mtime, "subdirs": subdirs, "books": files}
+                    listed += 1
+            except OSError as e:
+                # Vanished mid-scan or unreadable - skip it, keep scanning
+                log_error("scanner", f"Can't read {path}: {e}")
+                continue
+
+            dirs[rel] = entry
+            stack.extend(f"{rel}{os.sep}{name}" if rel else name for name in reversed(entry["subdirs"]))
+
+            dir_parts = rel.split(os.sep) if rel else []
+            for filename, asin in entry["books"]:
+                book_name = book_name_from_filename(filename) or filename
+                series_name, order = parse_path_hint(dir_parts, book_name, folder_books)
+                books.append({
+                    "path": f"{path}{os.sep}{filename}",
+                    "asin": asin,
+                    "title": book_name,
+                    "series_name": series_name,
+                    "order": order,
+                    "mtime": mtime
+                })
+
+        if listed or dirs.keys() != known.keys():
+            index[root] = dirs
+            save_index(index)
+
+    return books, {"dirs": len(dirs), "listed": listed, "books": len(books)}
+
+
+def book_from_path(root: str, path: str) -> Optional[dict]:
+    """
+    Describe one book file without scanning, e.g. for a watch event.
+
+    Returns:
+        Book dict as in scan_library() (without mtime), or None if the file
+        isn't an ASIN-named audio file under root
+    """
+    rel = os.path.relpath(path, os.path.abspath(root))
+    if rel.startswith(os.pardir) or not path.lower().endswith(AUDIO_EXTENSIONS):
+        return None
+
+    *dir_parts, filename = rel.split(os.sep)
+    book_name = book_name_from_filename(filename)
+    if not book_name:
+        return None
+
+    def folder_books(parts: list[str]) -> int:
+        try:
+            return _entry_books(*_list_directory(os.path.join(root, *parts)))
+        except OSError:
+            return 1
+
+    series_name, order = parse_path_hint(dir_parts, book_name, folder_books)
+    return {
+        "path": path,
+        "asin": ASIN_PATH_PATTERN.search(filename).group(1),
+        "title": book_name,
+        "series_name": series_name,
+        "order": order
+    }
+
+
+def local_series_id(series_name: str) -> str:
+    """ID of a series found on disk (series names are matched ignoring case)."""
+    return f"local:{series_name.casefold()}"
+
+
+def iter_local_series(books: list[dict]) -> Iterator[dict]:
+    """
+    Group scanned books into series, in the shape the ABS /series endpoint returns them.
+
+    Books without a series hint are left out. Series are yielded in name
+    order, so they can be passed to build_series_dict_from_series() and
+    series_fingerprint() unchanged.
+    """
+    grouped = {}
+    for book in books:
+        if not book["series_name"]:
+            continue
+        series = grouped.setdefault(book["series_name"].casefold(), {
+            "id": local_series_id(book["series_name"]),
+            "name": book["series_name"],
+            "books": []
+        })
+        item = {
+            "id": book["path"],
+            "path": book["path"],
+            "updatedAt": book.get("mtime"),
+            "media": {"metadata": {"title": book["title"], "asin": book["asin"], "seriesName": series["name"]}}
+        }
+        if book["order"] is not None:
+            item["sequence"] = f"{book['order']:g}"
+        series["books"].append(item)
+
+    for key in sorted(grouped):
+        yield grouped[key]
+
+
+def fetch_series_summaries_from_filesystem(root: Optional[str] = None) -> tuple[dict, dict]:
+    """
+    Scan a local library as compact per-series summaries.
+
+    Drop-in replacement for audiobookshelf.fetch_series_summaries() on
+    hosts without AudioBookShelf.
+
+    Args:
+        root: Library root (default LIBRARY_PATH)
+
+    Returns:
+        Tuple of (dict mapping series_name -> {max_order, sample_asin, books},
+        dict mapping series_name -> fingerprint)
+
+    Raises:
+        OSError: If the root can't be read
+    """
+    started = time.perf_counter()
+    books, stats = scan_library(root)
+
+    series_list = list(iter_local_series(books))
+    series_dict = build_series_dict_from_series(series_list)
+    fingerprints = {series["name"]: series_fingerprint(series) for series in series_list}
+
+    elapsed = time.perf_counter() - started
+    unsorted = sum(1 for book in books if not book["series_name"])
+    log("scanner", f"Scanned {stats['dirs']} directories ({stats['listed']} changed) in {elapsed * 1000:.0f}ms - "
+                   f"{stats['books']} books in {len(series_list)} series, {unsorted} without a series")
+    return series_dict, fingerprints
+
+
+def find_local_series(series_name: str, root: Optional[str] = None) -> dict:
+    """
+    Get one series from a local library, rescanning only changed directories.
+
+    Returns:
+        Series object with id, name and books (no books if it's gone)
+
+    Raises:
+        OSError: If the root can't be read
+    """
+    books, _ = scan_library(root)
+    key = series_name.casefold()
+    for series in iter_local_series([book for book in books if (book["series_name"] or "").casefold() == key]):
+        return series
+    return {"id": local_series_id(series_name), "name": series_name, "books": []}
+
+
+class InotifyWatcher:
+    """
+    Recursive watch of a directory tree through Linux inotify (via ctypes).
+
+    Reports files created, finished writing, moved or deleted anywhere
+    under the root; folders created later are watched as they appear.
+    """
+
+    def __init__(self, root: str):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._watches = {}  # watch descriptor -> directory
+        self.root = os.path.abspath(root)
+        self.add_tree(self.root)
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # ENOSPC: out of watches (fs.inotify.max_user_watches)
+            log_error("scanner", f"Can't watch {path}: {os.strerror(errno)}")
+            return
+        self._watches[wd] = path
+
+    def add_tree(self, path: str) -> list[str]:
+        """
+        Watch a directory and everything below it.
+
+        Returns:
+            Files already in the tree - they may have landed before the
+            watch was in place
+        """
+        files = []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            self._add_watch(current)
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            files.append(entry.path)
+            except OSError:
+                continue
+        return files
+
+    def read_events(self, timeout: Optional[float] = None) -> list[tuple[str, int]]:
+        """
+        Wait for file events.
+
+        Args:
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            List of (file path, inotify mask); empty on timeout
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.extend((found, IN_CREATE) for found in self.add_tree(path))
+                continue
+            events.append((path, mask))
+
+        return events
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+if __name__ == "__main__":
+    # Test the module
+    print(f"Scanning {LIBRARY_PATH}...")
+    series_dict, _ = fetch_series_summaries_from_filesystem()
+
+    print(f"\nProcessed {len(series_dict)} series:")
+    for name, data in sorted(series_dict.items()):
+        print(f"  {name}: max #{data['max_order']} ({len(data['books'])} books)")
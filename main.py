@@ -9,7 +9,13 @@ to identify the next book in each series you're reading.
 import argparse
 import sys
 from next_book_finder import process_all_series
-from storage import print_next_books, save_cache, load_cache, get_releasing_today
+from abs_listener import run_listener
+from audible_api import close_client
+from audiobookshelf import close_session
+from audible_cache import set_cache_enabled, purge_cache
+from storage import print_next_books, save_results, export_json, get_releasing_today, OUTPUT_PATH
+from storage import get_last_run, get_released_since, get_upcoming_releases, print_releases
+from storage import begin_cache_session, end_cache_session, flush_pending_writes, get_io_stats
 from notifications import notify_new_releases, notify_releasing_today
 from logger import log, log_header, log_footer, close_log, log_error
 
@@ -23,7 +29,13 @@ Examples:
     python main.py                  # Run with default settings (console + JSON)
     python main.py --console-only   # Only print to console, don't save
     python main.py --force          # Force update all series (ignore cache)
+    python main.py --full-sync      # Re-read the whole ABS library, not just changes
     python main.py --show           # Just show cached results
+    python main.py --upcoming 30    # Also list books releasing in the next 30 days
+    python main.py --listen         # Refresh series as AudioBookShelf (or the library folder) changes
+    python main.py --no-cache       # Ignore cached Audible responses
+    python main.py purge-cache      # Delete cached Audible responses
+    python main.py export-json      # Write next_books.json from the SQLite storage
         """
     )
     # Only output to console, don't save to JSON file
@@ -38,12 +50,51 @@ Examples:
         action="store_true",
         help="Force update all series, ignoring cache"
     )
+    # Re-read every series from AudioBookShelf instead of only changed ones
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Re-read the whole AudioBookShelf library instead of only changed series"
+    )
     # Just show cached results without fetching new data
     parser.add_argument(
         "--show",
         action="store_true",
         help="Just show cached results without fetching new data"
     )
+    # How far ahead to list upcoming releases
+    parser.add_argument(
+        "--upcoming",
+        type=int,
+        default=7,
+        metavar="DAYS",
+        help="List next books releasing within DAYS days (default 7, 0 to skip)"
+    )
+    # Keep running and refresh series as AudioBookShelf reports changes
+    parser.add_argument(
+        "--listen",
+        action="store_true",
+        help="Listen for AudioBookShelf (or library folder) changes and refresh affected series until Ctrl+C"
+    )
+    # Bypass the on-disk Audible response cache
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write cached Audible responses"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    # Delete every cached Audible response and exit
+    subparsers.add_parser(
+        "purge-cache",
+        help="Delete all cached Audible responses and exit"
+    )
+    # Write the stored results as JSON and exit
+    export_parser = subparsers.add_parser(
+        "export-json",
+        help="Write the stored results to next_books.json (or PATH) and exit"
+    )
+    export_parser.add_argument("path", nargs="?", help="File to write instead of next_books.json")
 
     args = parser.parse_args()
 
@@ -52,10 +103,45 @@ Examples:
         log_header()
         log("main", "Script started")
 
+        if args.command == "purge-cache":
+            removed = purge_cache()
+            print(f"Removed {removed} cached Audible responses")
+            log("main", "Script completed")
+            close_client()
+            close_session()
+            log_footer()
+            close_log()
+            return 0
+
+        if args.command == "export-json":
+            written = export_json(args.path)
+            print(f"Exported results to {written}" if written else f"{OUTPUT_PATH} is already up to date")
+            log("main", "Script completed")
+            log_footer()
+            close_log()
+            return 0
+
+        if args.no_cache:
+            log("main", "Audible response cache disabled (--no-cache flag)")
+            set_cache_enabled(False)
+
+        if args.listen:
+            # Refresh series as ABS reports changes, until interrupted
+            log("main", "Listening for AudioBookShelf changes (--listen flag)")
+            exit_code = run_listener()
+            log("main", "Script completed")
+            close_client()
+            close_session()
+            log_footer()
+            close_log()
+            return exit_code
+
         if args.show:
             # Just display cached results
             log("main", "Showing cached results (--show flag)")
             print_next_books()
+            if args.upcoming > 0:
+                print_releases(f"Releasing in the next {args.upcoming} days", get_upcoming_releases(args.upcoming))
             log("main", "Script completed")
             log_footer()
             close_log()
@@ -67,7 +153,10 @@ Examples:
         print("=" * 60)
         print()
 
-        results, new_releases = process_all_series(force_update=args.force)
+        # Read next_books.json once and write it once, at the end
+        begin_cache_session()
+        last_run = get_last_run()
+        results, new_releases = process_all_series(force_update=args.force, full_sync=args.full_sync)
 
         # Output results (with new releases highlighted)
         print_next_books(results, new_releases)
@@ -84,16 +173,28 @@ Examples:
                 print(f"  {book['series_name']}: #{book['sequence']} - {book['title']}")
             notify_releasing_today(releasing_today)
 
+        # Books that came out between runs, and those coming up
+        if last_run:
+            print_releases(f"Released since the last run ({last_run[:10]})", get_released_since(last_run))
+        if args.upcoming > 0:
+            print_releases(f"Releasing in the next {args.upcoming} days", get_upcoming_releases(args.upcoming))
+
         # Save to file unless console-only mode
         if not args.console_only:
-            cache = load_cache()
-            cache["series"] = results
-            cache["new_releases"] = new_releases
-            save_cache(cache)
+            save_results(results, new_releases)
             print(f"\nResults saved to next_books.json")
+        end_cache_session()
+        # The run is done - write what the write interval held back now rather than at exit
+        flush_pending_writes()
+
+        io_stats = get_io_stats()
+        print(f"Cache file I/O: read {io_stats['bytes_read'] / 1024:.1f} KB, "
+              f"wrote {io_stats['bytes_written'] / 1024:.1f} KB")
 
         # Log summary
         log("main", f"Script completed - {len(results)} series, {len(new_releases)} new releases, {len(releasing_today)} releasing today")
+        close_client()
+        close_session()
         log_footer()
         close_log()
         return 0
@@ -101,6 +202,10 @@ Examples:
     except KeyboardInterrupt:
         print("\nInterrupted by user")
         log("main", "Interrupted by user")
+        # Keep the series that were finished before the interrupt
+        end_cache_session()
+        close_client()
+        close_session()
         log_footer()
         close_log()
         return 1
@@ -109,6 +214,9 @@ Examples:
         import traceback
         traceback.print_exc()
         log_error("main", str(e))
+        end_cache_session()
+        close_client()
+        close_session()
         log_footer()
         close_log()
         return 1
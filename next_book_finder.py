@@ -1,31 +1,42 @@
 """Core logic for finding next books in series."""
 
+import asyncio
+import hashlib
+import config
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional
-from audiobookshelf import fetch_all_series, build_series_dict_from_series
-from audible_api import search_series_books
-from storage import should_update_series, update_series, get_all_next_books, detect_new_release
+from audiobookshelf import fetch_series_summaries, fetch_updated_series, build_series_dict_from_series, series_fingerprint
+from audiobookshelf import fetch_series_items, get_sources, default_source, source_key
+from abs_database import fetch_series_summaries_from_database
+from library_scanner import fetch_series_summaries_from_filesystem, find_local_series
+from audible_api import resolve_series_async, get_series_components_async, get_component_books_async
+from audible_api import search_series_by_title_async, run_sync, AudibleLookupError, AudibleUnavailableError
+from audible_api import get_limiter_stats, get_dedup_stats, get_breaker_stats
+from storage import should_update_series, update_series, get_all_next_books, detect_new_release, get_cached_series
+from storage import get_series_mapping, save_series_mapping, clear_series_mapping, get_sync_state, save_sync_state
+from storage import get_library_digest, save_library_digest, cache_session
 from config import EXCLUDED_SERIES
-from logger import log
+from logger import log, log_error
 
 
-def find_next_book(series_name: str, owned_max: float, sample_asin: str) -> Optional[dict]:
-    """
-    Find the next book in a series after the owned_max.
+# Maximum number of series looked up on Audible at the same time
+AUDIBLE_CONCURRENCY = getattr(config, "AUDIBLE_CONCURRENCY", 8)
 
-    Args:
-        series_name: Name of the series
-        owned_max: Highest book number currently owned
-        sample_asin: ASIN of a book in the series (for API lookup)
+# Series components whose details are fetched per step of the lazy walk
+LAZY_WINDOW = 3
 
-    Returns:
-        Dict with next book info or None if not found
-    """
-    # Search for all books in the series
-    all_books = search_series_books(series_name, sample_asin)
+# Days after which series with an unknown or unreleased next book are looked
+# up on Audible again even if their owned books haven't changed
+LIBRARY_RECHECK_DAYS = getattr(config, "LIBRARY_RECHECK_DAYS", 7)
+
+# Returned by find_next_book() when Audible could not be queried - unlike
+# None, which means the lookup worked and there is no next book
+LOOKUP_FAILED = object()
 
-    if not all_books:
-        return None
 
+def _select_next_book(all_books: list[dict], owned_max: float) -> Optional[dict]:
+    """Pick the lowest whole-numbered book after owned_max from a series listing."""
     # Find the next book after owned_max (skip fractional books like 1.5, 2.5)
     next_book = None
     for book in all_books:
@@ -39,30 +50,604 @@ def find_next_book(series_name: str, owned_max: float, sample_asin: str) -> Opti
     return next_book
 
 
-def process_all_series(force_update: bool = False) -> tuple[dict, list]:
+def _parse_sequence(value) -> Optional[float]:
+    """Parse a relationship sequence like "4" or "4.5"; None for ranges and blanks."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+async def _find_next_in_components(components: list[dict], target_series: dict,
+                                   owned_max: float) -> tuple[bool, Optional[dict]]:
+    """
+    Walk series components in sort order and stop at the first valid next book.
+
+    Components whose relationship sequence is at or below owned_max (or is
+    fractional) are skipped without fetching anything. The rest are fetched
+    LAZY_WINDOW at a time until one of them turns out to be the next book.
+
+    Returns:
+        Tuple of (components_usable, next_book_or_None) - components_usable is
+        False when books were fetched but none of them is really in the series
+    """
+    candidates = []
+    for component in components:
+        seq = _parse_sequence(component.get("sequence"))
+        if seq is not None and (seq <= owned_max or seq != int(seq)):
+            continue
+        candidates.append(component)
+
+    # Every listed book is owned
+    if not candidates:
+        return True, None
+
+    found_members = False
+    for i in range(0, len(candidates), LAZY_WINDOW):
+        books = await get_component_books_async(candidates[i:i + LAZY_WINDOW], target_series)
+        found_members = found_members or bool(books)
+        next_book = _select_next_book(books, owned_max)
+        if next_book:
+            return True, next_book
+
+    return found_members, None
+
+
+async def _find_next_in_series(target_series: dict, owned_max: float) -> tuple[bool, Optional[dict]]:
+    """
+    Find the next book in a known Audible series.
+
+    Uses the series' component list when Audible has one, and falls back to
+    a catalog search by series title when it doesn't (or when none of the
+    listed books turns out to be in the series).
+
+    Returns:
+        Tuple of (series_has_books, next_book_or_None)
+    """
+    components = await get_series_components_async(target_series["asin"])
+    if components:
+        usable, next_book = await _find_next_in_components(components, target_series, owned_max)
+        if usable:
+            return True, next_book
+        log("finder", f"No listed book of Audible series {target_series['asin']} is in it - searching by title")
+
+    all_books = await search_series_by_title_async(target_series)
+    if not all_books:
+        return False, None
+
+    return True, _select_next_book(all_books, owned_max)
+
+
+async def find_next_book_async(series_name: str, owned_max: float, sample_asin: str) -> Optional[dict]:
+    """
+    Find the next book in a series after the owned_max.
+
+    The Audible series a sample ASIN belongs to is remembered between runs,
+    so warm lookups skip straight to listing the series. Only the series
+    members after owned_max have their details fetched.
+
+    Args:
+        series_name: Name of the series
+        owned_max: Highest book number currently owned
+        sample_asin: ASIN of a book in the series (for API lookup)
+
+    Returns:
+        Dict with next book info, None if the series has no next book, or
+        LOOKUP_FAILED if Audible could not be queried
+    """
+    try:
+        return await _lookup_next_book(series_name, owned_max, sample_asin)
+    except AudibleUnavailableError:
+        # Circuit is open - the breaker already logged why
+        return LOOKUP_FAILED
+    except AudibleLookupError as e:
+        log_error("finder", f"Lookup failed for {series_name}: {e}")
+        return LOOKUP_FAILED
+
+
+async def _lookup_next_book(series_name: str, owned_max: float, sample_asin: str) -> Optional[dict]:
+    """Body of find_next_book_async(); lets AudibleLookupError propagate."""
+    # Use the remembered series if it still lists books
+    target_series = get_series_mapping(series_name, sample_asin)
+    if target_series:
+        has_books, next_book = await _find_next_in_series(target_series, owned_max)
+        if has_books:
+            return next_book
+
+        log("finder", f"Stored Audible series for {series_name} returned no books - resolving again")
+        clear_series_mapping(series_name)
+
+    # Otherwise resolve it from the sample book
+    target_series = await resolve_series_async(series_name, sample_asin)
+    if not target_series:
+        return None
+    save_series_mapping(series_name, sample_asin, target_series)
+
+    _, next_book = await _find_next_in_series(target_series, owned_max)
+    return next_book
+
+
+def find_next_book(series_name: str, owned_max: float, sample_asin: str) -> Optional[dict]:
+    """Synchronous wrapper for find_next_book_async()."""
+    return run_sync(find_next_book_async(series_name, owned_max, sample_asin))
+
+
+async def _find_next_books_async(lookups: list[tuple], concurrency: int) -> list[Optional[dict]]:
+    """Resolve many series at once, with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(series_name: str, owned_max: float, sample_asin: str) -> Optional[dict]:
+        async with semaphore:
+            return await find_next_book_async(series_name, owned_max, sample_asin)
+
+    return await asyncio.gather(*(resolve(*lookup) for lookup in lookups))
+
+
+def find_next_books(lookups: list[tuple], concurrency: Optional[int] = None) -> list[Optional[dict]]:
+    """
+    Find the next book for many series concurrently.
+
+    Args:
+        lookups: List of (series_name, owned_max, sample_asin) tuples
+        concurrency: Max series resolved at the same time (default AUDIBLE_CONCURRENCY)
+
+    Returns:
+        List of find_next_book() results (next book dict, None or LOOKUP_FAILED),
+        in the same order as lookups
+    """
+    if not lookups:
+        return []
+
+    return run_sync(_find_next_books_async(lookups, max(concurrency or AUDIBLE_CONCURRENCY, 1)))
+
+
+def _load_source(source: dict, known: dict, full_sync: bool, labelled: bool) -> tuple[dict, dict]:
+    """
+    Load one library's series, re-parsing only what changed.
+
+    Args:
+        source: Library source (see audiobookshelf.get_sources())
+        known: The source's stored sync state, series_name -> entry
+        full_sync: If True, download and re-parse the whole library
+        labelled: Prefix messages with the library name (several libraries)
+
+    Returns:
+        Tuple of (series_name -> {max_order, sample_asin, ...} for series with
+        valid ASINs, new sync state entries for the source)
+    """
+    prefix = f"[{source['name']}] " if labelled else ""
+
+    if source.get("library_path"):
+        # Only directories that changed since the last scan are listed again
+        print(f"{prefix}Scanning the library folder...")
+        log("finder", f"{prefix}Scanning {source['library_path']}...")
+        changed, fingerprints = fetch_series_summaries_from_filesystem(source["library_path"])
+        print(f"{prefix}Found {len(fingerprints)} series in library")
+        log("finder", f"{prefix}Found {len(fingerprints)} series in library")
+        known = {}
+    elif source["database_path"]:
+        # Reading the local database is cheap, so every run is a full sync
+        print(f"{prefix}Reading series from the AudioBookShelf database...")
+        log("finder", f"{prefix}Reading series from {source['database_path']}...")
+        changed, fingerprints = fetch_series_summaries_from_database(source["database_path"], source["library_id"])
+        print(f"{prefix}Found {len(fingerprints)} series in library")
+        log("finder", f"{prefix}Found {len(fingerprints)} series in library")
+        known = {}
+    elif full_sync or not known:
+        print(f"{prefix}Fetching series from AudioBookShelf...")
+        log("finder", f"{prefix}Fetching series from AudioBookShelf...")
+        changed, fingerprints = fetch_series_summaries(source=source)
+        print(f"{prefix}Found {len(fingerprints)} series in library")
+        log("finder", f"{prefix}Found {len(fingerprints)} series in library")
+        known = {}
+    else:
+        print(f"{prefix}Fetching changed series from AudioBookShelf...")
+        log("finder", f"{prefix}Fetching changed series from AudioBookShelf...")
+        series_list = fetch_updated_series({name: entry.get("fingerprint") for name, entry in known.items()},
+                                           source=source)
+        changed = build_series_dict_from_series(series_list)
+        fingerprints = {series.get("name", ""): series_fingerprint(series) for series in series_list}
+
+    # Stored order first (changed series replaced in place), then new series
+    state = dict(known)
+    for name, fingerprint in fingerprints.items():
+        if not name:
+            continue
+        data = changed.get(name, {})
+        for book in data.get("books", []):
+            book["library"] = source["name"]
+        state[name] = {
+            "fingerprint": fingerprint,
+            "max_order": data.get("max_order", 0),
+            "sample_asin": data.get("sample_asin"),
+            "asins": [book["asin"] for book in data.get("books", [])]
+        }
+
+    series_dict = {}
+    for name, entry in state.items():
+        if name in changed:
+            series_dict[name] = changed[name]
+        elif entry.get("sample_asin"):
+            series_dict[name] = {"max_order": entry["max_order"], "sample_asin": entry["sample_asin"]}
+
+    if known:
+        unchanged = len(state) - len(fingerprints)
+        print(f"{prefix}Found {len(fingerprints)} new or changed series, skipped {unchanged} unchanged")
+        log("finder", f"{prefix}Incremental sync: {len(fingerprints)} new or changed series, skipped {unchanged} unchanged")
+
+    return series_dict, state
+
+
+def merge_library_series(libraries: list[tuple[str, dict]]) -> dict:
+    """
+    Merge the series of several libraries into one dictionary.
+
+    A series owned in more than one library (matched by name, ignoring
+    case) is kept once, with the highest owned book of any library, so it
+    is only looked up on Audible once.
+
+    Args:
+        libraries: List of (library_name, series_dict) in priority order
+
+    Returns:
+        Dict mapping series_name -> {max_order, sample_asin, libraries, ...}
+    """
+    merged = {}
+    names = {}
+
+    for library, series_dict in libraries:
+        for series_name, data in series_dict.items():
+            name = names.setdefault(series_name.casefold(), series_name)
+            entry = merged.get(name)
+            if entry is None:
+                merged[name] = {**data, "libraries": [library]}
+                continue
+
+            entry["libraries"].append(library)
+            if data["max_order"] > entry["max_order"]:
+                entry["max_order"] = data["max_order"]
+                entry["sample_asin"] = data["sample_asin"]
+            if "books" in data:
+                entry["books"] = entry.get("books", []) + data["books"]
+
+    return merged
+
+
+def load_library(full_sync: bool = False) -> dict:
+    """
+    Get the owned series from every AudioBookShelf library, re-parsing only what changed.
+
+    Each series' fingerprint (book IDs and updatedAt values) is stored
+    with its computed max_order/sample_asin and owned ASINs, per library.
+    Later runs only download the series ABS reports as most recently
+    updated until they reach one whose fingerprint is unchanged; every
+    other series reuses its stored values. Series deleted from ABS are only
+    noticed by a full sync, which streams the library page by page so only
+    the per-series summaries are kept. A library with a database_path is
+    read straight from the AudioBookShelf database instead, and one with a
+    library_path is scanned from disk (see library_scanner), in full on
+    every run.
+
+    Libraries are loaded concurrently, then merged with series owned in
+    several libraries deduplicated (see merge_library_series()).
+
+    Args:
+        full_sync: If True, download and re-parse every library in full
+
+    Returns:
+        Dict mapping series_name -> {max_order, sample_asin, libraries, ...} for series with valid ASINs
+    """
+    sources = get_sources()
+    stored = get_sync_state()
+    stored_sources = stored.get("sources", {})
+    if not stored_sources and stored.get("series") and len(sources) == 1:
+        # Sync state saved before multi-library support
+        stored_sources = {source_key(sources[0]): {"series": stored["series"]}}
+
+    labelled = len(sources) > 1
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        loaded = list(pool.map(
+            lambda source: _load_source(source, stored_sources.get(source_key(source), {}).get("series", {}),
+                                        full_sync, labelled),
+            sources
+        ))
+
+    save_sync_state({
+        "synced_at": datetime.now().isoformat(),
+        "sources": {
+            source_key(source): {"name": source["name"], "series": state}
+            for source, (_, state) in zip(sources, loaded)
+        }
+    })
+
+    series_dict = merge_library_series([(source["name"], series) for source, (series, _) in zip(sources, loaded)])
+
+    if labelled:
+        total = sum(len(series) for series, _ in loaded)
+        print(f"Merged {total} series from {len(sources)} libraries into {len(series_dict)} "
+              f"({total - len(series_dict)} owned in more than one)")
+        log("finder", f"Merged {total} series from {len(sources)} libraries into {len(series_dict)} "
+                      f"({total - len(series_dict)} owned in more than one)")
+
+    return series_dict
+
+
+def library_digest(series_dict: dict) -> str:
+    """
+    Digest the parts of the library the Audible phase depends on.
+
+    Covers every series that isn't excluded, by name, max order and sample
+    ASIN, so it only changes when a lookup could turn out differently.
+
+    Args:
+        series_dict: Dict from load_library()
+
+    Returns:
+        Hex digest
+    """
+    entries = sorted(
+        f"{series_name}\t{data['max_order']}\t{data['sample_asin']}"
+        for series_name, data in series_dict.items()
+        if series_name not in EXCLUDED_SERIES
+    )
+    return hashlib.sha1("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def _recheck_due(last: dict) -> bool:
+    """Whether the last recheck of unchanged series (see _audible_phase_decision) is LIBRARY_RECHECK_DAYS old."""
+    stamp = last.get("rechecked_at")
+    if not stamp:
+        return False
+    try:
+        rechecked_at = datetime.fromisoformat(stamp)
+    except (TypeError, ValueError):
+        return True
+    return datetime.now() - rechecked_at >= timedelta(days=LIBRARY_RECHECK_DAYS)
+
+
+def _audible_phase_decision(digest: str, force_update: bool) -> tuple[bool, bool, str]:
+    """
+    Decide whether the Audible phase can be skipped, and whether it rechecks unchanged series.
+
+    Series whose owned books didn't change are normally not looked up again.
+    At least once every LIBRARY_RECHECK_DAYS, those whose next book is
+    unknown or not released yet are looked up anyway, since Audible may have
+    announced or rescheduled it.
+
+    Returns:
+        Tuple of (skip, recheck, reason)
+    """
+    if force_update:
+        return False, False, "forced"
+
+    last = get_library_digest()
+    recheck = _recheck_due(last)
+    if not last.get("digest"):
+        return False, recheck, "no complete previous run"
+    if last["digest"] != digest:
+        return False, recheck, f"changed from {last['digest']}"
+
+    try:
+        checked_at = datetime.fromisoformat(last["checked_at"])
+    except (KeyError, TypeError, ValueError):
+        return False, recheck, "no complete previous run"
+    if recheck:
+        return False, True, f"unchanged since {checked_at:%Y-%m-%d %H:%M}, but due for a recheck"
+
+    return True, False, f"unchanged since {checked_at:%Y-%m-%d %H:%M}"
+
+
+def _next_book_may_change(series_name: str, today: str) -> bool:
+    """Whether a series' cached next book is unknown or still unreleased, so a recheck could change it."""
+    cached = get_cached_series(series_name)
+    next_book = cached.get("next_book") if cached else None
+    return not next_book or not next_book.get("issue_date") or next_book["issue_date"] > today
+
+
+def _report_next_book(series_name: str, next_book: Optional[dict]) -> Optional[dict]:
+    """
+    Print and log a series' lookup result.
+
+    Returns:
+        New release dict if the series just gained a next book, else None
+    """
+    if not next_book:
+        print(f"    -> No next book found (series complete?)")
+        log("finder", f"No next book found for: {series_name}")
+        return None
+
+    issue_info = f" (Release: {next_book.get('issue_date')})" if next_book.get('issue_date') else ""
+    print(f"    -> Next: #{next_book['sequence']} - {next_book['title']}{issue_info}")
+    log("finder", f"Next book found: #{next_book['sequence']} - {next_book['title']}{issue_info}")
+
+    # Check if this is a new release (was null, now has a book)
+    if not detect_new_release(series_name, next_book):
+        return None
+
+    print(f"    ** NEW RELEASE! **")
+    log("finder", f"NEW RELEASE DETECTED: {series_name} - {next_book['title']}")
+    return {
+        "series_name": series_name,
+        "asin": next_book["asin"],
+        "title": next_book["title"],
+        "sequence": next_book["sequence"],
+        "cover_url": next_book.get("cover_url", ""),
+        "issue_date": next_book.get("issue_date", "")
+    }
+
+
+def refresh_series(series_id: str, series_name: str, source: Optional[dict] = None) -> Optional[dict]:
+    """
+    Re-read a single series from its library and update its next book.
+
+    Used by the listener to react to one change without walking the whole
+    library. The series' sync state is updated too (in a library that has
+    been synced before), so the next scheduled run doesn't fetch it again.
+    The owned max is still taken across every library the series is owned
+    in (matched by name, ignoring case), and the series is cached under the
+    same name a full run would use.
+
+    Args:
+        series_id: ABS ID of the series
+        series_name: Name of the series
+        source: Library the series changed in (default default_source())
+
+    Returns:
+        New release dict if the series just gained a next book, else None
+
+    Raises:
+        CircuitOpenError: If AudioBookShelf has been failing and is being skipped
+        requests.RequestException: If the series can't be fetched from AudioBookShelf
+        OSError: If a local library folder can't be read
+    """
+    if series_name in EXCLUDED_SERIES:
+        log("finder", f"Skipping excluded series: {series_name}")
+        return None
+
+    source = source or default_source()
+    if source.get("library_path"):
+        series = find_local_series(series_name, source["library_path"])
+    else:
+        series = {"id": series_id, "name": series_name, "books": fetch_series_items(series_id, source=source)}
+    data = build_series_dict_from_series([series]).get(series_name)
+
+    entry = None
+    if data:
+        entry = {
+            "fingerprint": series_fingerprint(series),
+            "max_order": data["max_order"],
+            "sample_asin": data["sample_asin"],
+            "asins": [book["asin"] for book in data["books"]]
+        }
+
+    configured_sources = get_sources()
+    state = get_sync_state()
+    stored_sources = state.get("sources", {})
+    if not stored_sources and state.get("series") and len(configured_sources) == 1:
+        # Sync state from before multiple libraries, as load_library() reads it
+        stored_sources = {source_key(configured_sources[0]): {"name": configured_sources[0]["name"],
+                                                              "series": state["series"]}}
+
+    # Only touch libraries that have been synced - a library with sync state
+    # is loaded incrementally, so one refreshed series must not stand in for
+    # a library the next run hasn't read yet
+    key = source_key(source)
+    known = stored_sources.get(key, {}).get("series")
+    if known:
+        if entry:
+            known[series_name] = entry
+        else:
+            known.pop(series_name, None)
+        state["sources"] = stored_sources
+        save_sync_state(state)
+
+    # The series may be owned in other libraries too, maybe spelled differently -
+    # match it like merge_library_series() and use the name a full run caches it under
+    folded = series_name.casefold()
+    owned = []
+    canonical = None
+    for configured in configured_sources:
+        if source_key(configured) == key:
+            # This library as just read, whether or not it has sync state
+            candidates = dict(stored_sources.get(key, {}).get("series", {}))
+            candidates.pop(series_name, None)
+            if entry:
+                candidates[series_name] = entry
+        else:
+            candidates = stored_sources.get(source_key(configured), {}).get("series", {})
+        for name, candidate in candidates.items():
+            if name.casefold() == folded and candidate.get("sample_asin"):
+                owned.append(candidate)
+                canonical = canonical or name
+    if not owned:
+        log("finder", f"No books with ASINs left in series: {series_name}")
+        return None
+    best = max(owned, key=lambda candidate: candidate["max_order"])
+
+    series_name = canonical
+    if series_name in EXCLUDED_SERIES:
+        log("finder", f"Skipping excluded series: {series_name}")
+        return None
+
+    owned_max = best["max_order"]
+    if not should_update_series(series_name, owned_max):
+        log("finder", f"Skipping (cached): {series_name}")
+        return None
+
+    print(f"  Processing: {series_name} (own up to #{owned_max})")
+    log("finder", f"Processing: {series_name} (own up to #{owned_max})")
+
+    next_book = find_next_book(series_name, owned_max, best["sample_asin"])
+    if next_book is LOOKUP_FAILED:
+        print(f"    -> Lookup failed, keeping cached result")
+        log("finder", f"Lookup failed, keeping cached result for: {series_name}")
+        return None
+
+    release = _report_next_book(series_name, next_book)
+    update_series(series_name, owned_max, next_book)
+    return release
+
+
+def process_all_series(force_update: bool = False, concurrency: Optional[int] = None,
+                       full_sync: bool = False) -> tuple[dict, list]:
     """
     Process all series and find next books.
 
+    Audible lookups for every series that needs one run concurrently first;
+    results are then reported and cached in library order, so the output is
+    the same as resolving the series one after another.
+
+    The whole Audible phase is skipped when the library digest matches the
+    last complete run, unless a recheck is due (every LIBRARY_RECHECK_DAYS),
+    which also looks up series with an unknown or unreleased next book.
+
     Args:
         force_update: If True, update all series regardless of cache
+        concurrency: Max series resolved at the same time (default AUDIBLE_CONCURRENCY)
+        full_sync: If True, re-read the whole ABS library instead of only changed series
 
     Returns:
         Tuple of (all_series_dict, new_releases_list)
     """
-    print("Fetching series from AudioBookShelf...")
-    log("finder", "Fetching series from AudioBookShelf...")
-    series_list = fetch_all_series()
-    print(f"Found {len(series_list)} series in library")
-    log("finder", f"Found {len(series_list)} series in library")
+    # Every cache read and write of the run is served from memory and
+    # written to next_books.json once
+    with cache_session():
+        return _process_all_series(force_update, concurrency, full_sync)
+
 
-    series_dict = build_series_dict_from_series(series_list)
+def _process_all_series(force_update: bool, concurrency: Optional[int], full_sync: bool) -> tuple[dict, list]:
+    """Body of process_all_series(), run inside a cache session."""
+    series_dict = load_library(full_sync)
     print(f"Processed {len(series_dict)} series with valid ASINs")
     log("finder", f"Processed {len(series_dict)} series with valid ASINs")
 
+    digest = library_digest(series_dict)
+    skip, recheck, reason = _audible_phase_decision(digest, force_update)
+    if skip:
+        print("Library unchanged since the last run - skipping Audible lookups")
+        log("finder", f"Library digest {digest} ({reason}) - skipping Audible phase")
+        return get_all_next_books(), []
+    log("finder", f"Library digest {digest} ({reason}) - running Audible phase")
+
     updated_count = 0
     skipped_count = 0
+    failed_count = 0
     new_releases = []
 
+    # Resolve every series that needs an update up front, concurrently
+    today = datetime.now().strftime("%Y-%m-%d")
+    lookups = [
+        (series_name, data["max_order"], data["sample_asin"])
+        for series_name, data in series_dict.items()
+        if series_name not in EXCLUDED_SERIES
+        and (force_update or should_update_series(series_name, data["max_order"])
+             or (recheck and _next_book_may_change(series_name, today)))
+    ]
+    if recheck:
+        print(f"Rechecking series with an unknown or unreleased next book ({len(lookups)} lookups)")
+        log("finder", f"Recheck due - {len(lookups)} series looked up")
+    found = dict(zip((lookup[0] for lookup in lookups), find_next_books(lookups, concurrency)))
+
     for series_name, data in series_dict.items():
         # Skip excluded series
         if series_name in EXCLUDED_SERIES:
@@ -72,10 +657,9 @@ def process_all_series(force_update: bool = False) -> tuple[dict, list]:
             continue
 
         owned_max = data["max_order"]
-        sample_asin = data["sample_asin"]
 
         # Check if we need to update this series
-        if not force_update and not should_update_series(series_name, owned_max):
+        if series_name not in found:
             print(f"  Skipping (cached): {series_name}")
             log("finder", f"Skipping (cached): {series_name}")
             skipped_count += 1
@@ -84,29 +668,19 @@ def process_all_series(force_update: bool = False) -> tuple[dict, list]:
         print(f"  Processing: {series_name} (own up to #{owned_max})")
         log("finder", f"Processing: {series_name} (own up to #{owned_max})")
 
-        # Find the next book
-        next_book = find_next_book(series_name, owned_max, sample_asin)
+        # Next book was looked up above
+        next_book = found[series_name]
 
-        if next_book:
-            issue_info = f" (Release: {next_book.get('issue_date')})" if next_book.get('issue_date') else ""
-            print(f"    -> Next: #{next_book['sequence']} - {next_book['title']}{issue_info}")
-            log("finder", f"Next book found: #{next_book['sequence']} - {next_book['title']}{issue_info}")
-
-            # Check if this is a new release (was null, now has a book)
-            if detect_new_release(series_name, next_book):
-                print(f"    ** NEW RELEASE! **")
-                log("finder", f"NEW RELEASE DETECTED: {series_name} - {next_book['title']}")
-                new_releases.append({
-                    "series_name": series_name,
-                    "asin": next_book["asin"],
-                    "title": next_book["title"],
-                    "sequence": next_book["sequence"],
-                    "cover_url": next_book.get("cover_url", ""),
-                    "issue_date": next_book.get("issue_date", "")
-                })
-        else:
-            print(f"    -> No next book found (series complete?)")
-            log("finder", f"No next book found for: {series_name}")
+        # Keep the cached result when Audible couldn't be reached
+        if next_book is LOOKUP_FAILED:
+            print(f"    -> Lookup failed, keeping cached result")
+            log("finder", f"Lookup failed, keeping cached result for: {series_name}")
+            failed_count += 1
+            continue
+
+        release = _report_next_book(series_name, next_book)
+        if release:
+            new_releases.append(release)
 
         # Update cache
         update_series(series_name, owned_max, next_book)
@@ -115,6 +689,29 @@ def process_all_series(force_update: bool = False) -> tuple[dict, list]:
     print(f"\nUpdated {updated_count} series, skipped {skipped_count}")
     log("finder", f"Updated {updated_count} series, skipped {skipped_count}")
 
+    if failed_count:
+        print(f"Lookups failed: {failed_count}")
+        log("finder", f"Lookups failed: {failed_count}")
+
+    # Only a run without failed lookups lets the next one be skipped
+    save_library_digest(None if failed_count else digest, rechecked=(recheck or force_update) and not failed_count)
+
+    breaker = get_breaker_stats()
+    if breaker["rejected"]:
+        print(f"Audible unavailable - circuit {breaker['state']}, {breaker['rejected']} request(s) skipped")
+        log("finder", f"Audible unavailable - circuit {breaker['state']}, {breaker['rejected']} request(s) skipped")
+
+    dedup = get_dedup_stats()
+    if dedup["series"] or dedup["product"]:
+        print(f"Duplicate Audible lookups coalesced: {dedup['series']} series, {dedup['product']} products")
+        log("finder", f"Duplicate Audible lookups coalesced: {dedup['series']} series, {dedup['product']} products")
+
+    limiter = get_limiter_stats()
+    log("finder", f"Audible rate limiter - {limiter['rate']} req/s, {limiter['throttle_events']} throttle events, "
+                  f"{limiter['retries']} retries, {limiter['wait_time']}s waiting")
+    if limiter["throttle_events"]:
+        print(f"Audible throttled {limiter['throttle_events']} request(s), rate now {limiter['rate']} req/s")
+
     if new_releases:
         print(f"New releases detected: {len(new_releases)}")
         log("finder", f"New releases detected: {len(new_releases)}")
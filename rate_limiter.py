@@ -0,0 +1,113 @@
+"""Adaptive token-bucket rate limiter for outgoing API requests."""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into a delay in seconds.
+
+    Accepts both forms allowed by HTTP: a number of seconds or an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or unparsable
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request to one service.
+
+    The refill rate adapts AIMD-style: each successful request adds
+    `increase` requests/second (up to max_rate), each throttled request
+    halves it (down to min_rate). A Retry-After from the server pauses
+    all callers until it has passed.
+    """
+
+    def __init__(self, rate: float, min_rate: float = 0.5, increase: float = 0.1, decrease: float = 0.5):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        self.throttle_events = 0
+        self.wait_time = 0.0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, max(self.rate, 1.0))
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then take a token."""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                delay = self.blocked_until - now
+            else:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+
+            self.wait_time += delay
+            await asyncio.sleep(delay)
+
+    def on_success(self) -> None:
+        """Additive increase after a request went through."""
+        self.rate = min(self.rate + self.increase, self.max_rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Multiplicative decrease after a 429/503.
+
+        Args:
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        self._refill()
+        self.rate = max(self.rate * self.decrease, self.min_rate)
+        self.tokens = min(self.tokens, 0.0)
+        self.throttle_events += 1
+
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def get_stats(self) -> dict:
+        """
+        Get the limiter's current state.
+
+        Returns:
+            Dict with rate (requests/second), throttle_events and wait_time (seconds)
+        """
+        return {
+            "rate": round(self.rate, 2),
+            "throttle_events": self.throttle_events,
+            "wait_time": round(self.wait_time, 2)
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the per-run counters (the learned rate is kept)."""
+        self.throttle_events = 0
+        self.wait_time = 0.0
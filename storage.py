@@ -1,43 +1,539 @@
 """Storage module for caching and persisting next book data."""
 
+import atexit
+import bisect
 import json
 import os
-from datetime import datetime
+import time
+import uuid
+import config
+import storage_sqlite
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from typing import Optional
 from config import OUTPUT_FILE
 from logger import log, log_error
+from atomic_file import atomic_write
 
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, OUTPUT_FILE)
 
+# Where the cache is kept: "json" (OUTPUT_FILE) or "sqlite" (STORAGE_DATABASE_FILE,
+# with OUTPUT_FILE exported from it after every run)
+STORAGE_BACKEND = getattr(config, "STORAGE_BACKEND", "json")
 
-def load_cache() -> dict:
-    """Load the cached next books data."""
+# Changes are written to the JSON cache at most once per this many seconds
+# (0 writes every change); unwritten changes are flushed at exit
+CACHE_WRITE_INTERVAL = getattr(config, "CACHE_WRITE_INTERVAL", 5)
+
+# Series updates are appended to a journal next to OUTPUT_FILE instead of
+# rewriting it; past this size the journal is folded back into OUTPUT_FILE
+CACHE_JOURNAL_MAX_KB = getattr(config, "CACHE_JOURNAL_MAX_KB", 256)
+
+# Folded journals are kept in an archive; past this size it is rotated to
+# <archive>.1, replacing the previous one (0 keeps no archive)
+CACHE_JOURNAL_ARCHIVE_MAX_KB = getattr(config, "CACHE_JOURNAL_ARCHIVE_MAX_KB", 4096)
+
+# Tags this process' journal lines, so they aren't replayed over its own cache
+_WRITER = uuid.uuid4().hex[:12]
+
+
+# Cache held in memory between begin_cache_session() and end_cache_session()
+_session = None
+
+# Cache with changes not yet written, outside a session (write-behind)
+_pending = None
+_last_write = 0.0
+
+# Cache this process last read from or wrote to the file, with the file's
+# identity then - a session reuses it while the file is unchanged
+_loaded = None
+
+# Next books sorted by issue date (JSON backend), see _get_release_index()
+_release_index = None
+
+# File I/O this run, see get_io_stats()
+_io_stats = {"loads": 0, "bytes_read": 0, "saves": 0, "appends": 0, "bytes_written": 0}
+
+
+def get_journal_path() -> str:
+    """Path of the series update journal kept next to OUTPUT_PATH."""
+    return os.path.splitext(OUTPUT_PATH)[0] + ".journal"
+
+
+def get_journal_archive_path() -> str:
+    """Path the journal's lines are moved to when it is compacted."""
+    return get_journal_path() + ".archive"
+
+
+def _get_compacting_path() -> str:
+    """Path the journal is moved to while it is being compacted."""
+    return get_journal_path() + ".compacting"
+
+
+def _read_cache_file() -> dict:
+    """Read and parse the cache file, then replay the journal on top of it."""
+    data = {"last_updated": None, "series": {}}
+
+    # Without the file the cache starts over - a journal left behind (e.g.
+    # after deleting next_books.json to reset it) isn't replayed. The empty
+    # cache is written right away, marking where in the journal it starts.
     if not os.path.exists(OUTPUT_PATH):
-        return {"last_updated": None, "series": {}}
+        if os.path.exists(get_journal_path()):
+            with open(get_journal_path(), "rb") as f:
+                journal_id = _journal_id(f.readline())
+                data["journal"] = {"id": journal_id, "offset": f.seek(0, os.SEEK_END)}
+            _write_cache_file(data)
+        return data
 
     try:
-        with open(OUTPUT_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        with open(OUTPUT_PATH, "rb") as f:
+            raw = f.read()
+        _io_stats["loads"] += 1
+        _io_stats["bytes_read"] += len(raw)
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
         print(f"Error loading cache: {e}")
         log_error("storage", f"Error loading cache: {e}")
-        return {"last_updated": None, "series": {}}
 
+    _replay_journal(data)
+    return data
 
-def save_cache(data: dict) -> None:
-    """Save the next books data to cache."""
+
+def _journal_id(first_line: bytes) -> Optional[str]:
+    """Get a journal's id from its first line (None for journals from before ids)."""
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        return None
+    return header.get("journal") if isinstance(header, dict) else None
+
+
+def _read_journal(path: str, position: Optional[dict]) -> tuple[Optional[str], list[dict], int]:
+    """
+    Read a journal's series updates past a position.
+
+    Args:
+        path: Journal file
+        position: {id, offset} recorded in a cache; lines before offset are
+            skipped if it is for this journal, otherwise every line is read
+
+    Returns:
+        Tuple of (journal id or None, list of update dicts, offset after
+        the last complete line)
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+        journal_id = _journal_id(first)
+
+        start = 0
+        if position and position.get("id") == journal_id and position.get("offset", 0) >= len(first):
+            start = position["offset"]
+            f.seek(start)
+            raw = f.read()
+        else:
+            raw = first + f.read()
+    _io_stats["bytes_read"] += len(raw)
+
+    entries = []
+    for line in raw.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # Last line cut short by a crash
+            continue
+        if isinstance(entry, dict) and "series" in entry:
+            entries.append(entry)
+
+    # A line still being appended by another process is read again next time
+    return journal_id, entries, start + raw.rfind(b"\n") + 1
+
+
+def _replay_journal(data: dict, skip_own: bool = False) -> int:
+    """
+    Apply the journal's series updates that the cache doesn't have yet.
+
+    The cache records how far into which journal it goes ("journal": {id,
+    offset}), so only lines appended after that are applied, in the order
+    they were appended - whichever process wrote them, and whatever the
+    clock said. Caches from before positions were recorded fall back to
+    the lines' timestamps.
+
+    Args:
+        data: Cache to update; its journal position is moved to the end
+        skip_own: Leave out this process' own lines (for its in-memory
+            cache, which already has them)
+
+    Returns:
+        Number of updates applied
+    """
+    position = data.get("journal")
+    legacy_since = None if position else (data.get("last_updated") or "")
+    series = data.setdefault("series", {})
+
+    journals = [get_journal_path()]
+    if position and os.path.exists(_get_compacting_path()):
+        # A compaction was cut short - its lines past the position may not be in the file
+        journals.insert(0, _get_compacting_path())
+
+    applied = 0
+    for path in journals:
+        if not os.path.exists(path):
+            continue
+        try:
+            journal_id, entries, offset = _read_journal(path, position)
+        except IOError as e:
+            log_error("storage", f"Error reading journal: {e}")
+            return applied
+        if path != get_journal_path() and journal_id != position.get("id"):
+            continue  # Already folded into the file
+
+        for entry in entries:
+            if legacy_since is not None and entry.get("at", "") <= legacy_since:
+                continue
+            if skip_own and entry.get("by") == _WRITER:
+                continue
+            series[entry["series"]] = {"owned_max": entry["owned_max"], "next_book": entry["next_book"]}
+            _index_release(series, entry["series"], entry["next_book"])
+            applied += 1
+        data["journal"] = {"id": journal_id, "offset": offset}
+
+    if applied:
+        log("storage", f"Replayed {applied} series updates from the journal")
+    return applied
+
+
+def _append_journal(entry: dict) -> int:
+    """
+    Append one update to the journal, starting a new journal if there is none.
+
+    Returns:
+        Size of the journal afterwards, in bytes
+    """
+    line = (json.dumps({**entry, "by": _WRITER}, ensure_ascii=False) + "\n").encode("utf-8")
+    with open(get_journal_path(), "ab") as f:
+        if f.tell() == 0:
+            # Tells this journal from the ones before it, see _replay_journal()
+            header = {"journal": uuid.uuid4().hex, "created": datetime.now().isoformat()}
+            line = (json.dumps(header) + "\n").encode("utf-8") + line
+        f.write(line)
+        size = f.tell()
+    _io_stats["appends"] += 1
+    _io_stats["bytes_written"] += len(line)
+    return size
+
+
+def _archive_journal(path: str) -> None:
+    """Move a compacted journal's lines to the end of the archive, rotating it when it gets too big."""
+    if CACHE_JOURNAL_ARCHIVE_MAX_KB > 0:
+        with open(path, "rb") as f:
+            raw = f.read()
+        archive = get_journal_archive_path()
+        if os.path.exists(archive) and os.path.getsize(archive) + len(raw) > CACHE_JOURNAL_ARCHIVE_MAX_KB * 1024:
+            os.replace(archive, archive + ".1")
+        with open(archive, "ab") as f:
+            f.write(raw)
+    os.remove(path)
+
+
+def _file_stamp() -> Optional[tuple]:
+    """Identity of the cache file as it is now (inode, size, mtime), None if missing."""
+    try:
+        st = os.stat(OUTPUT_PATH)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _write_cache_file(data: dict) -> None:
+    """Serialize and atomically write the whole cache file."""
+    global _last_write, _loaded
+
+    # Take in what other processes appended since this cache was read, so
+    # writing it doesn't undo their updates
+    _replay_journal(data, skip_own=True)
     data["last_updated"] = datetime.now().isoformat()
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    atomic_write(OUTPUT_PATH, raw)
+    _last_write = time.monotonic()
+    _loaded = {"data": data, "stamp": _file_stamp()}
+    _io_stats["saves"] += 1
+    _io_stats["bytes_written"] += len(raw)
     log("storage", "JSON cache updated")
 
 
+def _sqlite():
+    """
+    Get the SQLite backend, or None when the cache is the JSON file.
+
+    The first time the database is used, the existing JSON file is
+    imported into it.
+    """
+    if STORAGE_BACKEND != "sqlite":
+        return None
+
+    if not storage_sqlite.is_imported():
+        data = _read_cache_file()
+        storage_sqlite.import_cache(data)
+        log("storage", f"Imported {len(data.get('series', {}))} series from {OUTPUT_PATH} "
+                       f"into {storage_sqlite.DATABASE_PATH}")
+    return storage_sqlite
+
+
+def load_cache() -> dict:
+    """
+    Load the cached next books data.
+
+    Inside a session this is the in-memory cache itself; changes passed
+    to save_cache() are written by the next flush_cache_session().
+    """
+    db = _sqlite()
+    if db:
+        return db.export_cache()
+
+    if _session is not None:
+        return _session["data"]
+    if _pending is not None:
+        return _pending
+    return _read_cache_file()
+
+
+def save_cache(data: dict) -> None:
+    """Save the next books data to cache (deferred to the flush inside a session)."""
+    global _release_index
+
+    db = _sqlite()
+    if db:
+        db.import_cache(data)
+        return
+
+    _release_index = None
+    _save(data, "*")
+
+
+def export_json(path: Optional[str] = None) -> Optional[str]:
+    """
+    Write the whole cache as JSON, in the next_books.json layout.
+
+    With the SQLite backend this keeps next_books.json available to
+    --show and other readers; with the JSON backend the file already is
+    the cache, so only a different path is written.
+
+    Args:
+        path: File to write (default OUTPUT_PATH)
+
+    Returns:
+        The path written, or None if the JSON cache already is that file
+    """
+    if _sqlite() is None and (path is None or os.path.abspath(path) == OUTPUT_PATH):
+        return None
+
+    data = load_cache()
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    atomic_write(path or OUTPUT_PATH, raw)
+    _io_stats["saves"] += 1
+    _io_stats["bytes_written"] += len(raw)
+    log("storage", f"Exported {len(data.get('series', {}))} series to {path or OUTPUT_PATH}")
+    return path or OUTPUT_PATH
+
+
+def save_results(results: dict, new_releases: list) -> None:
+    """
+    Save a run's results and new releases, then export next_books.json if needed.
+
+    Also records the time of the run, see get_last_run().
+
+    Args:
+        results: Dict mapping series_name -> {owned_max, next_book}
+        new_releases: New releases detected by the run
+    """
+    now = datetime.now().isoformat()
+
+    db = _sqlite()
+    if db:
+        db.begin()
+        try:
+            db.replace_all_series(results)
+            db.save_new_releases(new_releases)
+            db.save_state("last_run", now)
+        finally:
+            db.end()
+        export_json()
+        return
+
+    cache = load_cache()
+    cache["series"] = results
+    cache["new_releases"] = new_releases
+    cache["last_run"] = now
+    save_cache(cache)
+
+
+def get_last_run() -> Optional[str]:
+    """Get when the last run's results were saved (ISO timestamp), or None."""
+    db = _sqlite()
+    if db:
+        return db.get_state("last_run")
+
+    return load_cache().get("last_run")
+
+
+def _write_due() -> bool:
+    """Whether CACHE_WRITE_INTERVAL has passed since the last write."""
+    return time.monotonic() - _last_write >= CACHE_WRITE_INTERVAL
+
+
+def _save(cache: dict, entry: str) -> None:
+    """
+    Record a change to the cache, writing it if CACHE_WRITE_INTERVAL has passed.
+
+    Changes made sooner after the last write stay in memory (served by
+    load_cache()) and are written with a later change, by
+    flush_pending_writes() or at exit.
+    """
+    global _pending
+
+    if _session is not None:
+        _session["data"] = cache
+        _session["dirty"].add(entry)
+        if _write_due():
+            flush_cache_session()
+        return
+
+    _pending = cache
+    if _write_due():
+        flush_pending_writes()
+
+
+def flush_pending_writes() -> None:
+    """Write changes held back by the write interval now (e.g. when idle, or at the end of a run)."""
+    global _pending
+
+    if _pending is not None:
+        _write_cache_file(_pending)
+        _pending = None
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Write whatever is still held back when the process exits."""
+    if _session is not None:
+        flush_cache_session()
+    flush_pending_writes()
+
+
+def begin_cache_session() -> None:
+    """
+    Load the cache once and serve every read and write from memory.
+
+    Until end_cache_session(), changes are only recorded as dirty entries.
+    Sessions nest - only the outermost end_cache_session() hands them on
+    to be written. A session started while the file is still as this
+    process last read or wrote it reuses that copy (replaying only the
+    journal), so back-to-back sessions don't re-read the file.
+
+    The SQLite backend needs no session: each write is its own short
+    transaction, so a run never holds the database's write lock while it
+    waits on Audible (and a --listen process can write in between).
+    """
+    global _session, _pending, _loaded
+
+    if _sqlite():
+        return
+
+    if _session is None:
+        started = get_io_stats()
+        if _pending is not None:
+            # Carry over changes still held back by the write interval
+            _session = {"data": _pending, "dirty": {"*"}, "depth": 0, "io_started": started}
+            _pending = None
+        else:
+            stamp = _file_stamp()
+            if _loaded is not None and stamp is not None and _loaded["stamp"] == stamp:
+                data = _loaded["data"]
+                _replay_journal(data, skip_own=True)
+            else:
+                data = _read_cache_file()
+                _loaded = {"data": data, "stamp": stamp}
+            _session = {"data": data, "dirty": set(), "depth": 0, "io_started": started}
+    _session["depth"] += 1
+
+
+def flush_cache_session() -> int:
+    """
+    Write the session's changes, if any, in a single save (a checkpoint).
+
+    Returns:
+        Number of changed entries written (0 with the SQLite backend, which
+        commits every write)
+    """
+    if _session is None or not _session["dirty"]:
+        return 0
+
+    count = len(_session["dirty"])
+    _write_cache_file(_session["data"])
+    _session["dirty"].clear()
+    return count
+
+
+def end_cache_session() -> None:
+    """
+    End the session, going back to reading the file on every access.
+
+    The session's changes are written like any other change: now if
+    CACHE_WRITE_INTERVAL has passed since the last write, otherwise by a
+    later write, flush_pending_writes() or at exit - so sessions ending in
+    quick succession (e.g. listener refreshes) share one write.
+    """
+    global _session, _pending
+
+    if _session is None:
+        return
+    _session["depth"] -= 1
+    if _session["depth"] > 0:
+        return
+
+    changed = len(_session["dirty"])
+    if changed:
+        _pending = _session["data"]
+    started = _session["io_started"]
+    _session = None
+
+    outcome = "written"
+    if changed:
+        if _write_due():
+            flush_pending_writes()
+        else:
+            outcome = "held back"
+    stats = {key: value - started[key] for key, value in get_io_stats().items()}
+    log("storage", f"Session ended - {changed} changed entries {outcome}; read {stats['bytes_read']} bytes "
+                   f"in {stats['loads']} loads, wrote {stats['bytes_written']} bytes in {stats['saves']} saves "
+                   f"and {stats['appends']} journal appends")
+
+
+@contextmanager
+def cache_session():
+    """Context manager around begin_cache_session() / end_cache_session()."""
+    begin_cache_session()
+    try:
+        yield
+    finally:
+        end_cache_session()
+
+
+def get_io_stats() -> dict:
+    """Get the cache file reads and writes of this process (loads, bytes_read, saves, appends, bytes_written)."""
+    return dict(_io_stats)
+
+
 def get_cached_series(series_name: str) -> Optional[dict]:
     """Get cached data for a specific series."""
+    db = _sqlite()
+    if db:
+        return db.get_series(series_name)
+
     cache = load_cache()
     return cache.get("series", {}).get(series_name)
 
@@ -62,26 +558,81 @@ def update_series(series_name: str, owned_max: float, next_book: Optional[dict])
     """
     Update the cache for a specific series.
 
+    With the JSON backend the change is appended to the journal (with a
+    timestamp and what changed) rather than rewriting the cache file.
+
     Args:
         series_name: Name of the series
         owned_max: Highest book number owned
         next_book: Dict with next book info (asin, title, sequence, cover_url) or None
     """
+    db = _sqlite()
+    if db:
+        db.update_series(series_name, owned_max, next_book)
+        return
+
     cache = load_cache()
 
     if "series" not in cache:
         cache["series"] = {}
 
-    cache["series"][series_name] = {
+    entry = {
         "owned_max": owned_max,
         "next_book": next_book
     }
+    previous = cache["series"].get(series_name)
+    if previous == entry:
+        return
 
-    save_cache(cache)
+    if previous is None:
+        reason = "added"
+    elif (previous.get("next_book") or {}).get("asin") != (next_book or {}).get("asin"):
+        reason = "next book changed"
+    elif previous.get("owned_max") != owned_max:
+        reason = "owned max changed"
+    else:
+        reason = "next book details changed"
+
+    cache["series"][series_name] = entry
+    _index_release(cache["series"], series_name, next_book)
+
+    # Only the journal is written - the whole file is rewritten when it's compacted
+    size = _append_journal({"at": datetime.now().isoformat(), "series": series_name, **entry, "reason": reason})
+    if size > CACHE_JOURNAL_MAX_KB * 1024:
+        log("storage", f"Journal reached {size} bytes - compacting it into {OUTPUT_PATH}")
+        _compact(cache)
+
+
+def _compact(cache: dict) -> None:
+    """Fold the journal into the cache file and archive it; updates from then on go to a new journal."""
+    global _pending
+
+    compacting = _get_compacting_path()
+    if os.path.exists(compacting):
+        # Left by a compaction cut short - its lines were replayed when the cache was read
+        _archive_journal(compacting)
+    try:
+        os.replace(get_journal_path(), compacting)
+    except FileNotFoundError:
+        return  # Another process compacted it first
+
+    # The write replays the moved journal up to its end (other processes'
+    # lines included), so the file then holds all of it
+    if _session is not None:
+        _session["dirty"].add("journal")
+        flush_cache_session()
+    else:
+        _pending = cache
+        flush_pending_writes()
+    _archive_journal(compacting)
 
 
 def get_all_next_books() -> dict:
     """Get all cached next books data."""
+    db = _sqlite()
+    if db:
+        return db.get_all_series()
+
     cache = load_cache()
     return cache.get("series", {})
 
@@ -109,17 +660,273 @@ def detect_new_release(series_name: str, new_next_book: Optional[dict]) -> bool:
     return old_next_book is None
 
 
+def get_series_mapping(series_name: str, sample_asin: str) -> Optional[dict]:
+    """
+    Get the remembered Audible series for an ABS series.
+
+    The mapping is only returned while ABS still reports the same sample
+    ASIN it was resolved from, and only if the stored entry is well formed.
+
+    Args:
+        series_name: ABS series name
+        sample_asin: ASIN of the owned book used for the lookup
+
+    Returns:
+        Dict with Audible series asin and title, or None if not known
+    """
+    db = _sqlite()
+    if db:
+        entry = db.get_series_mapping(series_name)
+    else:
+        entry = load_cache().get("audible_series", {}).get(series_name)
+    if not isinstance(entry, dict) or entry.get("sample_asin") != sample_asin:
+        return None
+
+    if not isinstance(entry.get("asin"), str) or not entry["asin"]:
+        return None
+    if not isinstance(entry.get("title"), str) or not entry["title"]:
+        return None
+
+    return {"asin": entry["asin"], "title": entry["title"]}
+
+
+def save_series_mapping(series_name: str, sample_asin: str, series: dict) -> None:
+    """
+    Remember which Audible series an ABS series resolved to.
+
+    Args:
+        series_name: ABS series name
+        sample_asin: ASIN of the owned book used for the lookup
+        series: Audible series dict with asin and title
+    """
+    entry = {
+        "sample_asin": sample_asin,
+        "asin": series.get("asin"),
+        "title": series.get("title")
+    }
+
+    db = _sqlite()
+    if db:
+        db.save_series_mapping(series_name, entry)
+        return
+
+    cache = load_cache()
+    cache.setdefault("audible_series", {})[series_name] = entry
+    _save(cache, f"audible_series/{series_name}")
+
+
+def clear_series_mapping(series_name: str) -> None:
+    """Forget the remembered Audible series for an ABS series."""
+    db = _sqlite()
+    if db:
+        db.save_series_mapping(series_name, None)
+        return
+
+    cache = load_cache()
+    if series_name in cache.get("audible_series", {}):
+        del cache["audible_series"][series_name]
+        _save(cache, f"audible_series/{series_name}")
+
+
+def get_sync_state() -> dict:
+    """
+    Get the ABS sync state from the last run.
+
+    Returns:
+        Dict with synced_at (ISO timestamp) and sources, mapping each
+        library's key -> {name, series}, where series maps series_name ->
+        {fingerprint, max_order, sample_asin, asins}; empty if never synced
+    """
+    db = _sqlite()
+    if db:
+        return db.get_state("abs_sync") or {}
+
+    cache = load_cache()
+    return cache.get("abs_sync", {})
+
+
+def save_sync_state(state: dict) -> None:
+    """Save the ABS sync state (see get_sync_state)."""
+    db = _sqlite()
+    if db:
+        db.save_state("abs_sync", state)
+        return
+
+    cache = load_cache()
+    cache["abs_sync"] = state
+    _save(cache, "abs_sync")
+
+
+def _index_owned_books(sources: dict) -> dict:
+    """Map each folded series name of a sync state's libraries to its owned books, see get_owned_books()."""
+    by_name = {}
+    for key, library in sources.items():
+        for name, entry in library.get("series", {}).items():
+            by_name.setdefault(name.casefold(), []).extend(
+                {"asin": asin, "library": library.get("name", key)} for asin in entry.get("asins", [])
+            )
+    return by_name
+
+
+def get_owned_books(series_name: str) -> list[dict]:
+    """
+    Get the owned books of a series and the library each one came from.
+
+    Libraries are matched by series name ignoring case, like the run
+    merges them.
+
+    Returns:
+        List of dicts with asin and library, from the last sync
+    """
+    sources = get_sync_state().get("sources", {})
+    return _index_owned_books(sources).get(series_name.casefold(), [])
+
+
+def get_library_digest() -> dict:
+    """
+    Get the library digest recorded after the last complete Audible phase.
+
+    Returns:
+        Dict with digest (None after a run with failed lookups), checked_at
+        and rechecked_at (ISO timestamps of the last complete phase and of the
+        last one that rechecked unchanged series); empty if none
+    """
+    db = _sqlite()
+    if db:
+        return db.get_state("library_digest") or {}
+
+    cache = load_cache()
+    return cache.get("library_digest") or {}
+
+
+def save_library_digest(digest: Optional[str], rechecked: bool = False) -> None:
+    """
+    Record the library digest of a complete Audible phase (None forgets it).
+
+    Args:
+        digest: Digest of the library, or None after failed lookups
+        rechecked: Whether the phase also rechecked series whose owned books didn't change
+    """
+    now = datetime.now().isoformat()
+    last = get_library_digest()
+    # Caches from before rechecks were tracked count from their last complete phase
+    rechecked_at = now if rechecked else (last.get("rechecked_at") or last.get("checked_at") or now)
+    entry = {"digest": digest, "checked_at": now, "rechecked_at": rechecked_at} if digest else None
+    if entry is None and rechecked_at:
+        # Keep when the last recheck happened even when the digest is forgotten
+        entry = {"digest": None, "rechecked_at": rechecked_at}
+
+    db = _sqlite()
+    if db:
+        db.save_state("library_digest", entry)
+        return
+
+    cache = load_cache()
+    if entry:
+        cache["library_digest"] = entry
+    else:
+        cache.pop("library_digest", None)
+    _save(cache, "library_digest")
+
+
 def get_new_releases() -> list:
     """Get the list of new releases from the cache."""
+    db = _sqlite()
+    if db:
+        return db.get_new_releases()
+
     cache = load_cache()
     return cache.get("new_releases", [])
 
 
 def save_new_releases(releases: list) -> None:
     """Save new releases to the cache."""
+    db = _sqlite()
+    if db:
+        db.save_new_releases(releases)
+        return
+
     cache = load_cache()
     cache["new_releases"] = releases
-    save_cache(cache)
+    _save(cache, "new_releases")
+
+
+def _get_release_index(series: dict) -> dict:
+    """
+    Get the release-date index of a series dict, building it if needed.
+
+    The index is kept for the series dict it was built from (the session's
+    cache during a run) and updated by update_series(); any other dict
+    gets a fresh index.
+
+    Returns:
+        Dict with dates (sorted list of (issue_date, series_name)) and
+        by_series (series_name -> issue_date)
+    """
+    global _release_index
+
+    if _release_index is None or _release_index["series"] is not series:
+        by_series = {
+            series_name: data["next_book"]["issue_date"]
+            for series_name, data in series.items()
+            if data.get("next_book") and data["next_book"].get("issue_date")
+        }
+        _release_index = {
+            "series": series,
+            "dates": sorted((issue_date, series_name) for series_name, issue_date in by_series.items()),
+            "by_series": by_series
+        }
+
+    return _release_index
+
+
+def _index_release(series: dict, series_name: str, next_book: Optional[dict]) -> None:
+    """Move a series to its new next book's issue date in the release-date index."""
+    if _release_index is None or _release_index["series"] is not series:
+        return  # Not indexed yet - built on the next query
+
+    dates = _release_index["dates"]
+    old_date = _release_index["by_series"].pop(series_name, None)
+    if old_date:
+        del dates[bisect.bisect_left(dates, (old_date, series_name))]
+
+    new_date = (next_book or {}).get("issue_date")
+    if new_date:
+        bisect.insort(dates, (new_date, series_name))
+        _release_index["by_series"][series_name] = new_date
+
+
+def get_releases_between(start: str, end: str) -> list:
+    """
+    Get the cached next books with an issue date in a range.
+
+    Args:
+        start: First date, "YYYY-MM-DD" (inclusive)
+        end: Last date, "YYYY-MM-DD" (inclusive)
+
+    Returns:
+        List of dicts with series_name and next_book info, by issue date
+    """
+    db = _sqlite()
+    if db:
+        # Indexed lookup by issue date
+        candidates = db.get_next_books_released(start, end)
+    else:
+        series = load_cache().get("series", {})
+        dates = _get_release_index(series)["dates"]
+        # (end + "\0", "") sorts after every entry dated end
+        first = bisect.bisect_left(dates, (start, ""))
+        last = bisect.bisect_left(dates, (end + "\0", ""))
+        candidates = [(series_name, series[series_name]["next_book"]) for _, series_name in dates[first:last]]
+
+    return [{
+        "series_name": series_name,
+        "asin": next_book.get("asin", ""),
+        "title": next_book.get("title", ""),
+        "sequence": next_book.get("sequence", 0),
+        "cover_url": next_book.get("cover_url", ""),
+        "issue_date": next_book.get("issue_date", "")
+    } for series_name, next_book in candidates]
 
 
 def get_releasing_today() -> list:
@@ -130,25 +937,33 @@ def get_releasing_today() -> list:
         List of dicts with series_name and next_book info for books releasing today
     """
     today = datetime.now().strftime("%Y-%m-%d")
-    cache = load_cache()
-    releasing_today = []
-
-    for series_name, data in cache.get("series", {}).items():
-        next_book = data.get("next_book")
-        if next_book and next_book.get("issue_date") == today:
-            releasing_today.append({
-                "series_name": series_name,
-                "asin": next_book.get("asin", ""),
-                "title": next_book.get("title", ""),
-                "sequence": next_book.get("sequence", 0),
-                "cover_url": next_book.get("cover_url", ""),
-                "issue_date": next_book.get("issue_date", "")
-            })
-            log("storage", f"Book releasing today: {series_name} - {next_book.get('title', '')}")
+    releasing_today = get_releases_between(today, today)
+
+    for book in releasing_today:
+        log("storage", f"Book releasing today: {book['series_name']} - {book['title']}")
 
     return releasing_today
 
 
+def get_upcoming_releases(days: int) -> list:
+    """Get the cached next books releasing after today and within the given number of days."""
+    today = datetime.now()
+    return get_releases_between((today + timedelta(days=1)).strftime("%Y-%m-%d"),
+                                (today + timedelta(days=days)).strftime("%Y-%m-%d"))
+
+
+def get_released_since(last_run: str) -> list:
+    """
+    Get the cached next books released after the day of last_run and before today.
+
+    Args:
+        last_run: ISO timestamp, e.g. from get_last_run()
+    """
+    since = datetime.fromisoformat(last_run) + timedelta(days=1)
+    yesterday = datetime.now() - timedelta(days=1)
+    return get_releases_between(since.strftime("%Y-%m-%d"), yesterday.strftime("%Y-%m-%d"))
+
+
 def print_new_releases(releases: list) -> None:
     """Print new releases prominently."""
     if not releases:
@@ -166,6 +981,16 @@ def print_new_releases(releases: list) -> None:
     print("\n" + "*" * 60)
 
 
+def print_releases(heading: str, releases: list) -> None:
+    """Print a list of releases (from get_releases_between()) under a heading, with their dates."""
+    if not releases:
+        return
+
+    print(f"\n{heading}: {len(releases)}")
+    for book in releases:
+        print(f"  {book['issue_date']}  {book['series_name']}: #{book['sequence']} - {book['title']}")
+
+
 def print_next_books(data: Optional[dict] = None, new_releases: Optional[list] = None) -> None:
     """Print next books in a formatted way."""
     # Print new releases first if any
@@ -183,26 +1008,40 @@ def print_next_books(data: Optional[dict] = None, new_releases: Optional[list] =
     print("NEXT BOOKS IN YOUR SERIES")
     print("=" * 60)
 
-    # Sort by series name
+    # The sync state is read and indexed once for every series, not once per series
+    sources = get_sync_state().get("sources", {})
+    owned_by_name = _index_owned_books(sources) if len(sources) > 1 else None
     for series_name in sorted(data.keys()):
-        info = data[series_name]
-        next_book = info.get("next_book")
-
-        print(f"\n{series_name}")
-        print(f"  Currently own up to: #{info.get('owned_max', '?')}")
-
-        if next_book:
-            issue_info = f" (Release: {next_book.get('issue_date')})" if next_book.get('issue_date') else ""
-            print(f"  Next book: #{next_book.get('sequence')} - {next_book.get('title')}{issue_info}")
-            print(f"  ASIN: {next_book.get('asin')}")
-            if next_book.get("cover_url"):
-                print(f"  Cover: {next_book.get('cover_url')}")
-        else:
-            print("  No next book available (series complete or not found)")
+        owned = owned_by_name.get(series_name.casefold(), []) if owned_by_name is not None else None
+        _print_series(series_name, data[series_name], owned)
 
     print("\n" + "=" * 60)
 
 
+def _print_series(series_name: str, info: dict, owned: Optional[list] = None) -> None:
+    """Print one series of print_next_books(), with the libraries of its owned books (None with one library)."""
+    next_book = info.get("next_book")
+
+    print(f"\n{series_name}")
+    print(f"  Currently own up to: #{info.get('owned_max', '?')}")
+
+    if owned is not None:
+        counts = {}
+        for book in owned:
+            counts[book["library"]] = counts.get(book["library"], 0) + 1
+        if counts:
+            print(f"  Owned in: {', '.join(f'{library} ({count})' for library, count in counts.items())}")
+
+    if next_book:
+        issue_info = f" (Release: {next_book.get('issue_date')})" if next_book.get('issue_date') else ""
+        print(f"  Next book: #{next_book.get('sequence')} - {next_book.get('title')}{issue_info}")
+        print(f"  ASIN: {next_book.get('asin')}")
+        if next_book.get("cover_url"):
+            print(f"  Cover: {next_book.get('cover_url')}")
+    else:
+        print("  No next book available (series complete or not found)")
+
+
 if __name__ == "__main__":
     # Test the module
     print("Testing storage module...")
@@ -0,0 +1,318 @@
+"""SQLite backend for the next books cache (see storage.STORAGE_BACKEND)."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Optional
+import config
+
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_PATH = os.path.join(SCRIPT_DIR, getattr(config, "STORAGE_DATABASE_FILE", "next_books.sqlite"))
+
+# Milliseconds to wait for another process's write (e.g. a --listen process)
+# before giving up with "database is locked"
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS series (
+        name TEXT PRIMARY KEY,
+        owned_max REAL NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS next_books (
+        series_name TEXT PRIMARY KEY REFERENCES series (name) ON DELETE CASCADE,
+        asin TEXT,
+        issue_date TEXT,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS next_books_issue_date ON next_books (issue_date);
+    CREATE TABLE IF NOT EXISTS release_history (
+        series_name TEXT NOT NULL,
+        asin TEXT NOT NULL,
+        issue_date TEXT,
+        detected_at TEXT NOT NULL,
+        is_current INTEGER NOT NULL DEFAULT 0,
+        data TEXT NOT NULL,
+        PRIMARY KEY (series_name, asin)
+    );
+    CREATE INDEX IF NOT EXISTS release_history_current ON release_history (is_current);
+    CREATE TABLE IF NOT EXISTS audible_series (
+        series_name TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+# Database state - opened lazily on first use
+_db = None
+_transaction_depth = 0
+_imported = False
+
+
+def _get_db() -> sqlite3.Connection:
+    """Open the database, creating the tables on first use."""
+    global _db
+
+    if _db is None:
+        _db = sqlite3.connect(DATABASE_PATH, isolation_level=None)
+        _db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        _db.execute("PRAGMA journal_mode=WAL")
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.execute("PRAGMA foreign_keys=ON")
+        _db.executescript(SCHEMA)
+
+    return _db
+
+
+def close() -> None:
+    """Close the database (it reopens on next use)."""
+    global _db, _transaction_depth, _imported
+
+    if _db is not None:
+        _db.close()
+        _db = None
+    _transaction_depth = 0
+    _imported = False
+
+
+def begin() -> None:
+    """
+    Start (or nest into) a transaction - writes are committed by the outermost end().
+
+    Meant for short groups of writes that must land together: the write
+    lock is taken right away (so waiting for another writer happens here,
+    under the busy timeout) and held until end().
+    """
+    global _transaction_depth
+
+    if _transaction_depth == 0:
+        _get_db().execute("BEGIN IMMEDIATE")
+    _transaction_depth += 1
+
+
+def end() -> None:
+    """Leave a transaction started by begin(), committing it if it's the outermost."""
+    global _transaction_depth
+
+    if _transaction_depth == 0:
+        return
+    _transaction_depth -= 1
+    if _transaction_depth == 0:
+        _get_db().execute("COMMIT")
+
+
+def _write(statements: list[tuple[str, tuple]]) -> None:
+    """Run statements atomically (inside the open transaction, if any, else committed right away)."""
+    db = _get_db()
+    db.execute("SAVEPOINT write")
+    try:
+        for sql, params in statements:
+            db.execute(sql, params)
+    except sqlite3.Error:
+        db.execute("ROLLBACK TO write")
+        db.execute("RELEASE write")
+        raise
+    db.execute("RELEASE write")
+
+
+def get_state(key: str):
+    """Get a JSON value from the state table (None if missing)."""
+    row = _get_db().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_state(key: str, value) -> None:
+    """Store a JSON value in the state table (None deletes it)."""
+    if value is None:
+        _write([("DELETE FROM state WHERE key = ?", (key,))])
+    else:
+        _write([("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                 (key, json.dumps(value, ensure_ascii=False)))])
+
+
+def _series_statements(series_name: str, owned_max: float, next_book: Optional[dict]) -> list[tuple[str, tuple]]:
+    """Statements that store one series and its next book."""
+    statements = [(
+        "INSERT INTO series (name, owned_max, updated_at) VALUES (?, ?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET owned_max = excluded.owned_max, updated_at = excluded.updated_at",
+        (series_name, owned_max, datetime.now().isoformat())
+    )]
+    if next_book:
+        statements.append((
+            "INSERT OR REPLACE INTO next_books (series_name, asin, issue_date, data) VALUES (?, ?, ?, ?)",
+            (series_name, next_book.get("asin"), next_book.get("issue_date") or None,
+             json.dumps(next_book, ensure_ascii=False))
+        ))
+    else:
+        statements.append(("DELETE FROM next_books WHERE series_name = ?", (series_name,)))
+    return statements
+
+
+def get_series(series_name: str) -> Optional[dict]:
+    """Get a series' {owned_max, next_book}, or None if it isn't stored."""
+    row = _get_db().execute(
+        "SELECT s.owned_max, n.data FROM series s LEFT JOIN next_books n ON n.series_name = s.name WHERE s.name = ?",
+        (series_name,)
+    ).fetchone()
+    if row is None:
+        return None
+    return {"owned_max": row[0], "next_book": json.loads(row[1]) if row[1] else None}
+
+
+def _touch_statement() -> tuple[str, tuple]:
+    """Statement recording when the cache last changed (last_updated in the JSON layout)."""
+    return ("INSERT OR REPLACE INTO state (key, value) VALUES ('last_updated', ?)",
+            (json.dumps(datetime.now().isoformat()),))
+
+
+def update_series(series_name: str, owned_max: float, next_book: Optional[dict]) -> None:
+    """Store a series' owned max and next book."""
+    _write(_series_statements(series_name, owned_max, next_book) + [_touch_statement()])
+
+
+def get_all_series() -> dict:
+    """Get every series as series_name -> {owned_max, next_book}, in name order."""
+    rows = _get_db().execute(
+        "SELECT s.name, s.owned_max, n.data FROM series s LEFT JOIN next_books n ON n.series_name = s.name "
+        "ORDER BY s.name"
+    )
+    return {name: {"owned_max": owned_max, "next_book": json.loads(data) if data else None}
+            for name, owned_max, data in rows}
+
+
+def replace_all_series(series: dict) -> None:
+    """Replace every stored series with series_name -> {owned_max, next_book}."""
+    statements = [("DELETE FROM series", ())]
+    for series_name, entry in series.items():
+        statements.extend(_series_statements(series_name, entry.get("owned_max", 0), entry.get("next_book")))
+    statements.append(_touch_statement())
+    _write(statements)
+
+
+def get_next_books_released(start: str, end: str) -> list[tuple[str, dict]]:
+    """
+    Get the next books with an issue date in a range (uses the issue_date index).
+
+    Args:
+        start: First date, "YYYY-MM-DD" (inclusive)
+        end: Last date, "YYYY-MM-DD" (inclusive)
+
+    Returns:
+        List of (series_name, next_book) ordered by issue date
+    """
+    rows = _get_db().execute(
+        "SELECT series_name, data FROM next_books WHERE issue_date BETWEEN ? AND ? ORDER BY issue_date, series_name",
+        (start, end)
+    )
+    return [(series_name, json.loads(data)) for series_name, data in rows]
+
+
+def get_series_mapping(series_name: str) -> Optional[dict]:
+    """Get the stored Audible series entry of a series (unvalidated)."""
+    row = _get_db().execute("SELECT data FROM audible_series WHERE series_name = ?", (series_name,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_series_mapping(series_name: str, entry: Optional[dict]) -> None:
+    """Store the Audible series entry of a series (None deletes it)."""
+    if entry is None:
+        _write([("DELETE FROM audible_series WHERE series_name = ?", (series_name,))])
+    else:
+        _write([("INSERT OR REPLACE INTO audible_series (series_name, data) VALUES (?, ?)",
+                 (series_name, json.dumps(entry, ensure_ascii=False)))])
+
+
+def get_new_releases() -> list:
+    """Get the current list of new releases, in the order they were saved."""
+    rows = _get_db().execute("SELECT data FROM release_history WHERE is_current = 1 ORDER BY rowid")
+    return [json.loads(data) for data, in rows]
+
+
+def save_new_releases(releases: list) -> None:
+    """
+    Make releases the current list of new releases.
+
+    Every release ever saved stays in the history with the time it was
+    first detected.
+    """
+    now = datetime.now().isoformat()
+    statements = [("UPDATE release_history SET is_current = 0 WHERE is_current = 1", ())]
+    for release in releases:
+        statements.append((
+            "INSERT INTO release_history (series_name, asin, issue_date, detected_at, is_current, data) "
+            "VALUES (?, ?, ?, ?, 1, ?) "
+            "ON CONFLICT (series_name, asin) DO UPDATE SET is_current = 1, issue_date = excluded.issue_date, "
+            "data = excluded.data",
+            (release.get("series_name", ""), release.get("asin", ""), release.get("issue_date") or None, now,
+             json.dumps(release, ensure_ascii=False))
+        ))
+    statements.append(_touch_statement())
+    _write(statements)
+
+
+def get_release_history() -> list[dict]:
+    """Get every release ever detected, newest first, each with its detected_at."""
+    rows = _get_db().execute("SELECT detected_at, data FROM release_history ORDER BY detected_at DESC, rowid DESC")
+    return [{**json.loads(data), "detected_at": detected_at} for detected_at, data in rows]
+
+
+def is_imported() -> bool:
+    """Whether the one-time import from next_books.json has been done."""
+    global _imported
+
+    if not _imported:
+        _imported = get_state("json_imported_at") is not None
+    return _imported
+
+
+def import_cache(data: dict) -> None:
+    """
+    Replace the database contents with a cache in the next_books.json layout.
+
+    Used for the one-time import of the JSON file (and by save_cache());
+    marks the import as done.
+    """
+    global _imported
+
+    statements = [("DELETE FROM series", ()), ("DELETE FROM audible_series", ()), ("DELETE FROM state", ())]
+    for series_name, entry in data.get("series", {}).items():
+        statements.extend(_series_statements(series_name, entry.get("owned_max", 0), entry.get("next_book")))
+    for series_name, entry in data.get("audible_series", {}).items():
+        statements.append(("INSERT INTO audible_series (series_name, data) VALUES (?, ?)",
+                           (series_name, json.dumps(entry, ensure_ascii=False))))
+    for key in ("abs_sync", "library_digest", "last_run", "last_updated"):
+        if data.get(key):
+            statements.append(("INSERT INTO state (key, value) VALUES (?, ?)",
+                               (key, json.dumps(data[key], ensure_ascii=False))))
+    statements.append(("INSERT INTO state (key, value) VALUES ('json_imported_at', ?)",
+                       (json.dumps(datetime.now().isoformat()),)))
+
+    begin()
+    try:
+        _write(statements)
+        save_new_releases(data.get("new_releases", []))
+    finally:
+        end()
+    _imported = True
+
+
+def export_cache() -> dict:
+    """Get the whole cache in the next_books.json layout."""
+    data = {"last_updated": get_state("last_updated"), "series": get_all_series()}
+
+    audible_series = {series_name: json.loads(entry) for series_name, entry in
+                      _get_db().execute("SELECT series_name, data FROM audible_series ORDER BY series_name")}
+    if audible_series:
+        data["audible_series"] = audible_series
+    for key in ("abs_sync", "library_digest", "last_run"):
+        value = get_state(key)
+        if value is not None:
+            data[key] = value
+    data["new_releases"] = get_new_releases()
+    return data